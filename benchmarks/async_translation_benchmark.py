@@ -0,0 +1,82 @@
+r"""Пропускная способность перевода через GoogleTranslator: синхронный клиент deep_translator в пуле потоков
+против AsyncTranslator с пулом keep-alive соединений aiohttp. Вместо translate.google.com используется тот же
+локальный HTTP-сервер, что и в google_batch_benchmark. Для каждого варианта печатается число установленных
+сервером TCP-соединений: синхронный клиент открывает новое соединение на каждый запрос.
+
+Запуск из корня проекта: python -m benchmarks.async_translation_benchmark --lines 500 --latency 0.05 --concurrency 4"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+from benchmarks.google_batch_benchmark import create_handler
+from benchmarks.parser_benchmark import create_corpus
+from parsers.modern_paradox_parser import ModernParadoxParser
+from translators.async_translator import AsyncTranslator
+from translators.translator_manager import TranslatorManager
+
+
+class CountingHTTPServer(ThreadingHTTPServer):
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+def measure(name: str, function, batches: list[list[str]], chars: int, server: CountingHTTPServer) -> list[str]:
+    server.connections = 0
+    start = time.perf_counter()
+    result = function(batches)
+    delta = time.perf_counter() - start
+    print(f'{name:<22} {len(batches):5} requests {server.connections:5} connections '
+          f'{delta:7.2f} s {chars / delta:10,.0f} chars/s')
+    return result
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--lines', type=int, default=500)
+    argument_parser.add_argument('--latency', type=float, default=0.05)
+    argument_parser.add_argument('--concurrency', type=int, default=4)
+    arguments = argument_parser.parse_args()
+
+    server = CountingHTTPServer(('127.0.0.1', 0), create_handler(arguments.latency))
+    # keep-alive, как у настоящего сервера; без TCP_NODELAY заголовки и тело ответа уходят отдельными пакетами
+    # и каждый ответ на живом соединении ждет задержанного подтверждения
+    server.RequestHandlerClass.protocol_version = 'HTTP/1.1'
+    server.RequestHandlerClass.disable_nagle_algorithm = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    translator = TranslatorManager(source_language='english', target_language='russian',
+                                   api_service='GoogleTranslator')
+    translator._translator._base_url = f'http://127.0.0.1:{server.server_address[1]}/m'
+
+    texts = [value[1:-1] for _, _, value in map(ModernParadoxParser.tokenize_line,
+                                                 create_corpus(arguments.lines * 2)) if value[1:-1].strip()]
+    texts = texts[:arguments.lines]
+    chars = sum(map(len, texts))
+    print(f'{len(texts)} lines, {chars:,} chars, {arguments.latency * 1000:.0f} ms latency per request, '
+          f'{arguments.concurrency} requests at once')
+
+    def translate_sync(batches: list[list[str]]) -> list[str]:
+        with ThreadPoolExecutor(max_workers=arguments.concurrency) as executor:
+            return [text for batch in executor.map(translator.translate_batch, batches) for text in batch]
+
+    async_translator = AsyncTranslator()
+
+    def translate_async(batches: list[list[str]]) -> list[str]:
+        return [text for batch in async_translator.iter_translated_batches(translator, batches, arguments.concurrency)
+                for text in batch]
+
+    for mode, batches in (('per line', [[text] for text in texts]),
+                          ('batched', [texts[batch] for batch in translator.get_translation_batches(texts)])):
+        sync = measure(f'sync {mode}', translate_sync, batches, chars, server)
+        asynchronous = measure(f'async {mode}', translate_async, batches, chars, server)
+        print(f'Same result: {sync == asynchronous}')
+    async_translator.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
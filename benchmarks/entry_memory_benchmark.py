@@ -0,0 +1,37 @@
+r"""Измерение памяти (tracemalloc), занимаемой разобранным файлом локализации:
+список словарей {'key': ..., 'value': ...} против списка LocalizationEntry со __slots__.
+
+Запуск из корня проекта: python -m benchmarks.entry_memory_benchmark --lines 200000"""
+import argparse
+import tracemalloc
+
+from benchmarks.parser_benchmark import create_corpus
+from parsers.modern_paradox_parser import ModernParadoxParser, LocalizationEntry
+
+
+def measure(name: str, factory, tokens: list[tuple[str, str, str]]) -> int:
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    storage = [factory(key, value) for key, _, value in tokens]
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in snapshot_end.compare_to(snapshot_start, 'filename'))
+    print(f'{name:<20} {size / 2 ** 20:8.2f} MB ({size / len(storage):6.1f} bytes per line, strings are shared)')
+    return size
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--lines', type=int, default=200_000)
+    arguments = argument_parser.parse_args()
+
+    tokens = [ModernParadoxParser.tokenize_line(line) for line in create_corpus(arguments.lines)]
+    print(f'Corpus: {len(tokens):,} lines')
+    dict_size = measure('dict per line', lambda key, value: {'key': key, 'value': value}, tokens)
+    entry_size = measure('LocalizationEntry', LocalizationEntry, tokens)
+    print(f'Container overhead reduction: {(dict_size - entry_size) / 2 ** 20:.2f} MB '
+          f'({(dict_size - entry_size) / len(tokens):.1f} bytes per line)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+r"""Пропускная способность перевода через GoogleTranslator: по одной строке на запрос против пакетов,
+склеенных через TranslatorManager.batch_separator. Вместо translate.google.com используется локальный
+HTTP-сервер, который имитирует задержку сети и отдает текст в верхнем регистре.
+
+Запуск из корня проекта: python -m benchmarks.google_batch_benchmark --lines 500 --latency 0.05"""
+import argparse
+import html
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.parser_benchmark import create_corpus
+from parsers.modern_paradox_parser import ModernParadoxParser
+from translators.translator_manager import TranslatorManager
+
+
+def create_handler(latency: float):
+    class FakeGoogleHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            text = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+            body = f'<html><body><div class="result-container">{html.escape(text.upper())}</div></body></html>'
+            body = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FakeGoogleHandler
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--lines', type=int, default=500)
+    argument_parser.add_argument('--latency', type=float, default=0.05)
+    arguments = argument_parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), create_handler(arguments.latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    translator = TranslatorManager(source_language='english', target_language='russian',
+                                   api_service='GoogleTranslator')
+    translator._translator._base_url = f'http://127.0.0.1:{server.server_address[1]}/m'
+
+    texts = [value[1:-1] for _, _, value in map(ModernParadoxParser.tokenize_line,
+                                                 create_corpus(arguments.lines * 2)) if value[1:-1].strip()]
+    texts = texts[:arguments.lines]
+    chars = sum(map(len, texts))
+    print(f'{len(texts)} lines, {chars:,} chars, {arguments.latency * 1000:.0f} ms latency per request')
+
+    start = time.perf_counter()
+    single = [translator.translate_batch([text])[0] for text in texts]
+    delta = time.perf_counter() - start
+    print(f'per line: {len(texts):5} requests {delta:7.2f} s {chars / delta:10,.0f} chars/s')
+
+    start = time.perf_counter()
+    batches = [texts[batch] for batch in translator.get_translation_batches(texts)]
+    batched = [text for batch in batches for text in translator.translate_batch(batch)]
+    delta = time.perf_counter() - start
+    print(f'batched:  {len(batches):5} requests {delta:7.2f} s {chars / delta:10,.0f} chars/s')
+    print(f'Same result: {single == batched}')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
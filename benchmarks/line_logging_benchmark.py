@@ -0,0 +1,64 @@
+r"""Накладные расходы журналирования на одну строку в ModernParadoxGamesPerformer._create_translated_list.
+Сравниваются обычный режим (перехват исключений на каждом построчном методе и отладочные сообщения,
+которые формируются даже при отключенном уровне DEBUG) и режим производительности (проверка уровня перед
+сообщением и перехват исключений на уровне файла). Перевод не выполняется - строки помечаются как #NT!,
+половина ключей берется из предыдущей версии перевода.
+
+Запуск из корня проекта: python -m benchmarks.line_logging_benchmark --lines 50000"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from benchmarks.parser_benchmark import create_corpus
+from info_data import FileInfoData
+from main import Prepper, ModernParadoxGamesPerformer
+
+
+def measure(corpus_file: Path, log_file: Path, level: str, performance_logging: bool, repeats: int) -> float:
+    r"""Лучшее из repeats время обработки всех строк файла, в секундах"""
+    logger.remove()
+    sink_id = logger.add(sink=log_file, level=level)
+    paths = Prepper(target_path=corpus_file.parent / 'target')
+    paths._previous_path_validate_result = True
+    performer = ModernParadoxGamesPerformer(paths=paths, original_language='english', target_language='russian',
+                                            performance_logging=performance_logging)
+    performer._create_original_language_dictionary(corpus_file)
+    performer._previous_version_dictionary = {key_value.key: key_value.value
+                                              for key_value in performer._original_language_list[::2]}
+    performer._current_process_file = corpus_file.name
+    performer.file_info_data = FileInfoData(filename=corpus_file)
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for line_number, key_value in enumerate(performer._original_language_list):
+            performer._current_line_number = line_number
+            performer._create_translated_list(key_value=key_value)
+        best = min(best, time.perf_counter() - start)
+    performer._translation_memory.close()
+    logger.remove(sink_id)
+    return best
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--lines', type=int, default=50000)
+    argument_parser.add_argument('--repeats', type=int, default=3)
+    arguments = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_file = Path(directory) / 'benchmark_l_english.yml'
+        corpus_file.write_text(''.join(create_corpus(arguments.lines)), encoding='utf-8-sig')
+        log_file = Path(directory) / 'debug.log'
+        print(f'{arguments.lines} lines')
+        for name, level, performance_logging in (('before, DEBUG log', 'DEBUG', False),
+                                                 ('before, INFO log', 'INFO', False),
+                                                 ('after, INFO log', 'INFO', True)):
+            delta = measure(corpus_file, log_file, level, performance_logging, arguments.repeats)
+            print(f'{name:18} {delta:7.3f} s {delta / arguments.lines * 1e6:8.2f} µs/line')
+
+
+if __name__ == '__main__':
+    main()
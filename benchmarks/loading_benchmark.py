@@ -0,0 +1,52 @@
+r"""Масштабирование загрузки корпуса локализации в пуле процессов (ModernParadoxParser.parse_files)
+для 1, 2, 4 и 8 процессов с последующим однопроходным объединением словарей.
+
+Запуск из корня проекта: python -m benchmarks.loading_benchmark --lines 500000 --files 400"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.parser_benchmark import create_corpus
+from parsers.modern_paradox_parser import ModernParadoxParser
+
+
+def write_corpus(directory: Path, amount_lines: int, amount_files: int) -> list[Path]:
+    lines = create_corpus(amount_lines)
+    per_file = max(1, len(lines) // amount_files)
+    files = []
+    for number, start in enumerate(range(0, len(lines), per_file)):
+        file = directory / f'corpus_{number}_l_english.yml'
+        with file.open(mode='w', encoding='utf-8-sig') as corpus_file:
+            corpus_file.write('l_english:\n')
+            corpus_file.writelines(lines[start:start + per_file])
+        files.append(file)
+    return files
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--lines', type=int, default=500_000)
+    argument_parser.add_argument('--files', type=int, default=400)
+    argument_parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    arguments = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = write_corpus(Path(directory), arguments.lines, arguments.files)
+        print(f'Corpus: {len(files)} files, {arguments.lines:,} lines')
+        reference = None
+        base_time = None
+        for workers in arguments.workers:
+            start = time.perf_counter()
+            dictionary = {}
+            for lines_dictionary in ModernParadoxParser.parse_files(files, workers=workers):
+                dictionary.update(lines_dictionary)
+            delta = time.perf_counter() - start
+            base_time = base_time or delta
+            reference = reference or dictionary
+            print(f'{workers} workers: {delta:7.3f} s, speedup x{base_time / delta:4.2f}, '
+                  f'same result: {dictionary == reference}')
+
+
+if __name__ == '__main__':
+    main()
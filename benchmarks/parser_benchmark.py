@@ -0,0 +1,71 @@
+r"""Сравнение скорости разбора строк локализации: старый вариант с двумя re.findall на строку
+против однопроходного ModernParadoxParser.tokenize_line.
+
+Запуск из корня проекта: python -m benchmarks.parser_benchmark --lines 500000"""
+import argparse
+import random
+import re
+import string
+import time
+
+from parsers.modern_paradox_parser import ModernParadoxParser
+
+
+def legacy_key(line: str) -> str:
+    separated_line = re.findall(pattern=r"(.*:)(\d*)( *)(\".*\")", string=line)
+    if separated_line:
+        return separated_line[0][0].strip()
+    return line.rstrip()
+
+
+def legacy_value(line: str) -> str:
+    value = re.findall(pattern=r'(\".*\w*?.*\")', string=line)
+    if value:
+        return value[0].rstrip()
+    return ''
+
+
+def create_corpus(amount: int, seed: int = 0) -> list[str]:
+    r"""Синтетический корпус, похожий на ванильную локализацию CK3/Stellaris:
+    заголовок, комментарии, пустые строки и строки key:0 "value" с переменными и форматированием"""
+    generator = random.Random(seed)
+    words = [''.join(generator.choices(string.ascii_lowercase, k=generator.randint(2, 10))) for _ in range(2000)]
+    decorations = ['[GetTitle.GetName]', '$VALUE$', '§Y', '§!', '#bold', '#!', '£gold£', '\\n']
+    lines = ['l_english:\n']
+    for number in range(amount - 1):
+        roll = generator.random()
+        if roll < 0.03:
+            lines.append('\n')
+        elif roll < 0.08:
+            lines.append(f'# {" ".join(generator.choices(words, k=generator.randint(3, 15)))}\n')
+        else:
+            text = generator.choices(words, k=generator.randint(1, 60))
+            for _ in range(generator.randint(0, 4)):
+                text.insert(generator.randint(0, len(text)), generator.choice(decorations))
+            lines.append(f' key_{number}_{generator.choice(words)}:{generator.randint(0, 3)} "{" ".join(text)}"\n')
+    return lines
+
+
+def measure(name: str, function, lines: list[str]) -> list:
+    start = time.perf_counter()
+    result = [function(line) for line in lines]
+    delta = time.perf_counter() - start
+    print(f'{name:<12} {delta:8.3f} s {len(lines) / delta:14,.0f} lines/s')
+    return result
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--lines', type=int, default=500_000)
+    arguments = argument_parser.parse_args()
+
+    lines = create_corpus(arguments.lines)
+    print(f'Corpus: {len(lines):,} lines, {sum(map(len, lines)) / 2 ** 20:.1f} MB')
+    legacy = measure('legacy', lambda line: (legacy_key(line), legacy_value(line)), lines)
+    tokenized = measure('tokenizer', ModernParadoxParser.tokenize_line, lines)
+    mismatches = sum(1 for old, new in zip(legacy, tokenized) if old != (new[0], new[2]))
+    print(f'Mismatched lines: {mismatches}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+r"""Экранирование и восстановление значений на строках с большим количеством переменных и форматирования:
+прежний способ (re.findall по некомпилированному шаблону, str.replace на каждое совпадение и на каждое
+значение при восстановлении, повторный поиск тегов для DeepL) против ShieldingEngine. Перевод имитируется
+возвратом той же строки, время - лучшее из --repeat запусков.
+
+Запуск из корня проекта: python -m benchmarks.shielding_benchmark --lines 20000 --placeholders 12"""
+import argparse
+import random
+import re
+import time
+
+from shielded_values import ShieldedValues, ShieldingEngine
+
+
+def create_lines(amount: int, placeholders: int, seed: int = 0) -> list[str]:
+    generator = random.Random(seed)
+    values = ['[GetTitle.GetName]', '[ROOT.Char.GetFirstName]', '$VALUE$', '$gold|0$', '§Y', '§!', '#bold', '#!',
+              '£gold£', '£prestige£']
+    words = ['the', 'realm', 'gains', 'gold', 'and', 'prestige', 'from', 'vassal', 'war', 'score']
+    lines = []
+    for _ in range(amount):
+        parts = [generator.choice(values) if generator.random() < 0.5 else generator.choice(words)
+                 for _ in range(placeholders * 2)]
+        lines.append(' '.join(parts))
+    return lines
+
+
+def shield_before(line: str, pattern: str, api_service: str) -> tuple[str, dict[int, str]]:
+    modified_values = {}
+    for shadow_number, step in enumerate(re.findall(pattern=pattern, string=line)):
+        modified_values[shadow_number] = step
+        if api_service == "GoogleTranslator":
+            line = line.replace(step, f"☻_{shadow_number}")
+        elif api_service == "DeepLTranslator":
+            line = line.replace(step, f'<span translate="no">{step}</span>')
+    return line, modified_values
+
+
+def restore_before(line: str, modified_values: dict[int, str], api_service: str) -> str:
+    if api_service == "GoogleTranslator":
+        for key, value in modified_values.items():
+            line = line.replace(f'☻_{key}', value)
+    if api_service == "DeepLTranslator":
+        tags = re.findall(pattern=r'(<[^>]*translate=\"no\"[^>]*>).*?(<[^>]*>)', string=line)
+        for open_tag, close_tag in tags:
+            line = line.replace(open_tag, '').replace(close_tag, '')
+    return line
+
+
+def measure(function, repeat: int) -> tuple[list[str], float]:
+    r"""Лучшее время из repeat запусков: на коротких замерах разброс между запусками больше самой разницы"""
+    deltas = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        deltas.append(time.perf_counter() - start)
+    return result, min(deltas)
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--lines', type=int, default=20000)
+    argument_parser.add_argument('--placeholders', type=int, default=12)
+    argument_parser.add_argument('--repeat', type=int, default=5)
+    arguments = argument_parser.parse_args()
+
+    lines = create_lines(arguments.lines, arguments.placeholders)
+    pattern = ShieldedValues.get_common_pattern()
+    engine = ShieldingEngine(pattern=pattern)
+    print(f'{len(lines)} lines, ~{arguments.placeholders} placeholders per line')
+    for api_service in ('GoogleTranslator', 'DeepLTranslator'):
+        before, before_delta = measure(lambda: [restore_before(*shield_before(line, pattern, api_service), api_service)
+                                                for line in lines], arguments.repeat)
+        after, after_delta = measure(lambda: [engine.restore(*engine.shield(line, api_service), api_service)
+                                              for line in lines], arguments.repeat)
+
+        print(f'{api_service:17} before {before_delta:6.3f} s  after {after_delta:6.3f} s  '
+              f'x{before_delta / after_delta:4.1f}  '
+              f'round trip intact: before {sum(map(str.__eq__, before, lines))}/{len(lines)}, '
+              f'after {sum(map(str.__eq__, after, lines))}/{len(lines)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from loguru import logger
+
+
+class SidecarFile:
+    r"""Служебный JSON-файл рядом с результатом перевода, хранящий данные по каждому файлу мода.
+    Ключ записи - путь файла мода относительно папки локализации. При несовпадении версии файл не читается"""
+    version = 1
+    file_name = ''
+
+    def __init__(self, directory: Path):
+        self._sidecar_file = directory / self.file_name
+        self._files: dict[str, dict] = {}
+        self._changed = False
+
+    @logger.catch()
+    def load(self):
+        self._files = {}
+        if not self._sidecar_file.exists():
+            return
+        try:
+            with self._sidecar_file.open(mode='r', encoding='utf-8') as file:
+                data = json.load(file)
+        except Exception as error:
+            logger.warning(f'{self._sidecar_file} is damaged and will be rebuilt: {error}')
+            return
+        if isinstance(data, dict) and data.get('version') == self.version:
+            self._files = data.get('files', {})
+
+    def get(self, file: Path) -> dict | None:
+        return self._files.get(Path(file).as_posix())
+
+    def update(self, file: Path, data: dict):
+        self._files[Path(file).as_posix()] = data
+        self._changed = True
+
+    def discard(self, file: Path):
+        if self._files.pop(Path(file).as_posix(), None) is not None:
+            self._changed = True
+
+    @logger.catch()
+    def save(self):
+        if not self._changed:
+            return
+        temporary_file = self._sidecar_file.with_suffix('.tmp')
+        with temporary_file.open(mode='w', encoding='utf-8') as file:
+            json.dump({'version': self.version, 'files': self._files}, file, ensure_ascii=False, indent=1)
+        temporary_file.replace(self._sidecar_file)
+        self._changed = False
+
+
+class BuildManifest(SidecarFile):
+    r"""Манифест сборки в целевой папке. Для каждого файла мода хранит отпечаток его входных данных:
+    хэш исходного файла, хэш соответствующих ему строк предыдущей версии перевода, версию индекса ванильной
+    локализации и влияющие на результат настройки. Файл, отпечаток которого не изменился с прошлого запуска,
+    а результат на месте, можно не обрабатывать заново"""
+    file_name = '.build_manifest.json'
+
+    @staticmethod
+    def get_hash(data) -> str:
+        return hashlib.sha1(json.dumps(data, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_file_hash(file: Path) -> str:
+        return hashlib.sha1(file.read_bytes()).hexdigest()
+
+
+class SourceSnapshot(SidecarFile):
+    r"""Исходные (непереведенные) значения всех строк, записанных в результат, по файлам мода.
+    При следующем обновлении папка с результатом становится предыдущей версией перевода, и по снимку видно,
+    у каких ключей с тех пор изменился исходный текст"""
+    file_name = '.source_snapshot.json'
+
+    def get_sources(self) -> dict[str, str]:
+        r"""Все ключи снимка со значениями исходного текста, без разбивки по файлам"""
+        sources = {}
+        for file_sources in self._files.values():
+            sources.update(file_sources)
+        return sources
+
+    def retain(self, files: list[Path]):
+        r"""Удаляет из снимка файлы, которых больше нет в моде"""
+        for file in set(self._files) - {Path(file).as_posix() for file in files}:
+            self.discard(Path(file))
+
+
+class CheckpointJournal:
+    r"""Журнал контрольных точек в целевой папке. Каждый полученный от сервиса перевод и каждый дописанный файл
+    сразу добавляются в журнал отдельной строкой JSON, а на диск журнал сбрасывается не реже раза
+    в checkpoint_interval секунд и после каждого файла. Если запуск прервался, при продолжении готовые файлы
+    пропускаются, а уже полученные переводы берутся из журнала без повторных запросов.
+    После полностью завершенного запуска журнал удаляется"""
+    file_name = '.checkpoint_journal.jsonl'
+
+    def __init__(self, directory: Path, checkpoint_interval: float = 5.0):
+        self._journal_file = directory / self.file_name
+        self._checkpoint_interval = checkpoint_interval
+        self._file = None
+        self._last_checkpoint = 0.0
+        self.translations: dict[tuple, str] = {}
+        self.finished_files: set[str] = set()
+
+    def exists(self) -> bool:
+        return self._journal_file.exists()
+
+    @logger.catch()
+    def load(self):
+        r"""Читает журнал прерванного запуска. Недописанная последняя строка пропускается"""
+        self.translations = {}
+        self.finished_files = set()
+        if not self._journal_file.exists():
+            return
+        with self._journal_file.open(mode='r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f'Damaged checkpoint record skipped: {line!r}')
+                    continue
+                if 'translation' in record:
+                    *key, translated_text = record['translation']
+                    self.translations[tuple(key)] = translated_text
+                elif 'finished' in record:
+                    self.finished_files.add(record['finished'])
+        logger.info(f'Checkpoint journal {self._journal_file}: {len(self.finished_files)} finished files, '
+                    f'{len(self.translations)} translations')
+
+    def open(self, resume: bool = False):
+        r"""Открывает журнал на запись. Без resume журнал прошлого запуска стирается"""
+        self._file = self._journal_file.open(mode='a' if resume else 'w', encoding='utf-8')
+        self._last_checkpoint = time.monotonic()
+
+    def is_finished(self, file: Path) -> bool:
+        return Path(file).as_posix() in self.finished_files
+
+    def add_translation(self, key: tuple, translated_text: str):
+        self._write({'translation': [*key, translated_text]})
+        self.checkpoint()
+
+    def finish_file(self, file: Path):
+        self.finished_files.add(Path(file).as_posix())
+        self._write({'finished': Path(file).as_posix()})
+        self.checkpoint(force=True)
+
+    def _write(self, record: dict):
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def checkpoint(self, force: bool = False):
+        if self._file is None or not force and time.monotonic() - self._last_checkpoint < self._checkpoint_interval:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_checkpoint = time.monotonic()
+
+    @logger.catch()
+    def close(self, completed: bool):
+        r"""Закрывает журнал. После завершенного запуска журнал больше не нужен и удаляется"""
+        if self._file is None:
+            return
+        self.checkpoint(force=True)
+        self._file.close()
+        self._file = None
+        if completed:
+            self._journal_file.unlink(missing_ok=True)
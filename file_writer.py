@@ -0,0 +1,79 @@
+import os
+from itertools import repeat
+from pathlib import Path
+
+
+class AtomicFileWriter:
+    r"""Запись файла результата через временный файл рядом с ним. Строки дописываются по порядку через большой
+    буфер, как только все строки перед ними готовы, и сразу освобождаются в списке результата, поэтому большой
+    файл не хранится в памяти целиком дважды. При выходе из with без ошибки временный файл одним переименованием
+    заменяет результат, а при ошибке удаляется - в папке мода не остается недописанных файлов локализации"""
+    buffer_size = 1024 * 1024
+    # Сколько готовых строк копится в списке, прежде чем их допишут в файл
+    chunk_lines = 1000
+
+    def __init__(self, file: Path, encoding: str = 'utf-8-sig'):
+        self.file = file
+        self._temporary_file = self.get_temporary_file(file)
+        self._encoding = encoding
+        self._stream = None
+        self._next_line = 0
+
+    @staticmethod
+    def get_temporary_file(file: Path) -> Path:
+        return file.with_name(f'{file.name}.tmp')
+
+    @classmethod
+    def remove_stale_file(cls, file: Path) -> bool:
+        r"""Удаляет временный файл, оставшийся от записи file, которую оборвало аварийное завершение программы.
+        Возвращает True, если такой файл был"""
+        temporary_file = cls.get_temporary_file(file)
+        if not temporary_file.exists():
+            return False
+        temporary_file.unlink()
+        return True
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def open(self):
+        self._stream = self._temporary_file.open(mode='w', encoding=self._encoding, buffering=self.buffer_size)
+        # Пустая запись, чтобы и у пустого файла была метка порядка байтов utf-8-sig
+        self._stream.write('')
+        self._next_line = 0
+
+    def commit(self):
+        r"""Закрывает временный файл и заменяет им результат"""
+        self._stream.close()
+        os.replace(self._temporary_file, self.file)
+
+    def discard(self):
+        r"""Закрывает и удаляет временный файл, результат остается прежним"""
+        if self._stream is not None:
+            self._stream.close()
+        self._temporary_file.unlink(missing_ok=True)
+
+    def write_ready(self, lines: list[str], ready_lines: int):
+        r"""Дописывает строки lines до ready_lines (не включительно), если их набралось не меньше chunk_lines"""
+        if ready_lines - self._next_line >= self.chunk_lines:
+            self._write(lines, ready_lines)
+
+    def write_rest(self, lines: list[str]):
+        r"""Дописывает все оставшиеся строки lines"""
+        self._write(lines, len(lines))
+
+    def write_lines(self, lines: list[str]):
+        r"""Дописывает строки lines целиком, без учета уже записанных"""
+        self._stream.writelines(lines)
+
+    def _write(self, lines: list[str], end: int):
+        self.write_lines(lines[self._next_line:end])
+        lines[self._next_line:end] = repeat('', end - self._next_line)
+        self._next_line = end
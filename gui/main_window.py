@@ -10,6 +10,7 @@ from pathlib import Path
 from PyQt5.QtCore import pyqtSlot
 from loguru import logger
 
+from build_manifest import CheckpointJournal
 from gui.stat_table_window import StatTableWindow
 from info_data import InfoData
 from settings import BASE_DIR, HOME_DIR, TRANSLATIONS_DIR, SCREEN_SIZE, PROGRAM_VERSION
@@ -33,12 +34,13 @@ if hasattr(QtCore.Qt, 'AA_UseHighDpiPixmaps'):
 class MainWindow(QtWidgets.QMainWindow):
 
     def __init__(self, parent=None):
-        logger.add(sink=BASE_DIR / 'logs/debug.log', rotation='10 MB', compression="zip")
-
         super(MainWindow, self).__init__(parent=parent)
         self.__ui = Ui_MainWindow()
         self.__ui.setupUi(self)
         self.__init_settings()
+        # В режиме производительности отладочные сообщения по каждой строке в журнал не пишутся
+        logger.add(sink=BASE_DIR / 'logs/debug.log', rotation='10 MB', compression="zip",
+                   level='INFO' if self.__settings.get_performance_logging() else 'DEBUG')
         self.__init_app_position()
         self.__init_languages()
         self.__init_game()
@@ -50,6 +52,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.__translator: TranslatorManager
 
         self.__ui.run_pushButton.setEnabled(False)
+        self.__ui.estimate_pushButton.setEnabled(False)
+        self.__ui.retry_pushButton.setEnabled(False)
 
         self.__ui.selector_original_language_comboBox.setCurrentText('english')
         self.__ui.selector_target_language_comboBox.setCurrentText('russian')
@@ -67,6 +71,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.__ui.check_all_pushButton.clicked.connect(self.__check_all_checkboxes)
         self.__ui.uncheck_all_pushButton.clicked.connect(self.__unchecked_all_checkboxes)
         self.__ui.run_pushButton.clicked.connect(self.__run)
+        self.__ui.estimate_pushButton.clicked.connect(self.__estimate)
+        self.__ui.retry_pushButton.clicked.connect(self.__retry_failed)
         self.__ui.discord_link_pushButton.clicked.connect(self.__discord_clicked)
         self.__ui.donate_pushButton.clicked.connect(self.__donate_clicked)
         self.__ui.game_directory_lineEdit.editingFinished.connect(self.__game_directory_changed)
@@ -422,8 +428,12 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.__prepper.get_original_mode_path_validate_result() and self.__prepper.get_game_path_validate_result() \
                 and self.__prepper.get_target_path_validate_result():
             self.__ui.run_pushButton.setEnabled(True)
+            self.__ui.estimate_pushButton.setEnabled(True)
+            self.__ui.retry_pushButton.setEnabled(True)
         else:
             self.__ui.run_pushButton.setEnabled(False)
+            self.__ui.estimate_pushButton.setEnabled(False)
+            self.__ui.retry_pushButton.setEnabled(False)
 
     @logger.catch()
     def __form_checkbox_cascade(self, *args):
@@ -492,7 +502,12 @@ class MainWindow(QtWidgets.QMainWindow):
     @pyqtSlot(InfoData)
     def stop_thread(self, data: InfoData = None):
         self.__ui.run_pushButton.setEnabled(True)
+        self.__ui.estimate_pushButton.setEnabled(True)
+        self.__ui.retry_pushButton.setEnabled(True)
         if data:
+            if data.translation_throughput:
+                self.__settings.set_translation_throughput(data.translation_throughput)
+                self.__settings.save_settings_data()
             stat_tables = StatTableWindow(parent=self, data=data)
             stat_tables.show()
         self.__running_thread.exec_()
@@ -520,19 +535,35 @@ class MainWindow(QtWidgets.QMainWindow):
         self.__settings.set_last_languages(original=self.__ui.selector_original_language_comboBox.currentText(),
                                            target=self.__ui.selector_target_language_comboBox.currentText())
         self.__settings.save_settings_data()
+        if self.__performer is not None:
+            self.__performer.cancel_translation()
         super(MainWindow, self).closeEvent(a0)
 
     ###
 
-    def __run(self):
+    def __estimate(self):
+        self.__run(dry_run=True)
+
+    def __retry_failed(self):
+        self.__run(retry_failed=True)
+
+    def __run(self, *args, dry_run: bool = False, retry_failed: bool = False):
         self.__ui.run_pushButton.setEnabled(False)
+        self.__ui.estimate_pushButton.setEnabled(False)
+        self.__ui.retry_pushButton.setEnabled(False)
         self.__translator.set_new_source_language(self.__ui.selector_original_language_comboBox.currentText())
         self.__translator.set_new_target_language(self.__ui.selector_target_language_comboBox.currentText())
+        self.__translator.set_google_batch_translation(self.__settings.get_google_batch_translation())
 
         self.__settings.set_last_languages(original=self.__ui.selector_original_language_comboBox.currentText(),
                                            target=self.__ui.selector_target_language_comboBox.currentText())
         self.__settings.save_settings_data()
         self.__ui.progressBar.setValue(0)
+        resume = False
+        if not retry_failed and CheckpointJournal(self.__prepper.get_target_path()).exists():
+            answer = QtWidgets.QMessageBox.question(self, LanguageConstants.resume_title,
+                                                   LanguageConstants.resume_question)
+            resume = answer == QtWidgets.QMessageBox.Yes
         self.__performer = ModernParadoxGamesPerformer(
             paths=self.__prepper,
             translator=self.__translator,
@@ -542,6 +573,22 @@ class MainWindow(QtWidgets.QMainWindow):
             need_translate_tuple=self.__get_all_checkboxes(),
             disable_original_line=self.__ui.disable_original_line_checkBox.isChecked(),
             protection_symbol=self.__settings.get_protection_symbol(),
+            localization_index_path=self.__settings.get_local_data_path() / 'localization index',
+            loading_processes=self.__settings.get_loading_processes(),
+            filter_vanilla_keys=self.__settings.get_filter_vanilla_keys(),
+            translation_memory_path=self.__settings.get_local_data_path() / 'translation memory.sqlite3',
+            deduplicate_translations=self.__settings.get_deduplicate_translations(),
+            translation_concurrency=self.__settings.get_translation_concurrency(),
+            async_translation=self.__settings.get_async_translation(),
+            request_rates=self.__settings.get_request_rates(),
+            dry_run=dry_run,
+            translation_throughput=self.__settings.get_translation_throughput(),
+            incremental_build=self.__settings.get_incremental_build(),
+            resume=resume,
+            retry_failed=retry_failed,
+            performance_logging=self.__settings.get_performance_logging(),
+            file_processes=self.__settings.get_file_processes(),
+            pipeline_processing=self.__settings.get_pipeline_processing(),
         )
 
         self.__running_thread = QtCore.QThread()
@@ -24,6 +24,10 @@ class SettingsWindow(QtWidgets.QDialog):
         self.__ui.apis_comboBox.currentTextChanged.connect(self.__change_current_api)
         self.__ui.save_settings_pushButton.clicked.connect(self.save_settings)
         self.__ui.protection_symbol_lineEdit.textChanged.connect(self.set_protection_symbol)
+        self.__ui.concurrency_spinBox.valueChanged.connect(self.set_translation_concurrency)
+        self.__ui.loading_processes_spinBox.valueChanged.connect(self.set_loading_processes)
+        self.__ui.file_processes_spinBox.valueChanged.connect(self.set_file_processes)
+        self.__ui.filter_vanilla_keys_checkBox.toggled.connect(self.set_filter_vanilla_keys)
 
     def __init_info_layouts(self):
         self.__info_layouts = {
@@ -40,14 +44,24 @@ class SettingsWindow(QtWidgets.QDialog):
         selected_api = self.__settings.get_translator_api()
         self.__ui.apis_comboBox.setCurrentText(selected_api)
         self.__ui.protection_symbol_lineEdit.setText(self.__settings.get_protection_symbol())
+        self.__set_concurrency_value(selected_api)
+        self.__ui.loading_processes_spinBox.setValue(self.__settings.get_loading_processes())
+        self.__ui.file_processes_spinBox.setValue(self.__settings.get_file_processes())
+        self.__ui.filter_vanilla_keys_checkBox.setChecked(self.__settings.get_filter_vanilla_keys())
         if selected_api in ['GoogleTranslator', ]:
             self.set_protection_symbols_enable(True)
         else:
             self.set_protection_symbols_enable()
 
+    def __set_concurrency_value(self, selected_api: str):
+        self.__ui.concurrency_spinBox.blockSignals(True)
+        self.__ui.concurrency_spinBox.setValue(self.__settings.get_translation_concurrency().get(selected_api, 1))
+        self.__ui.concurrency_spinBox.blockSignals(False)
+
     @logger.catch()
     def __change_current_api(self, selected_api):
         self.__settings.set_translator_api(selected_api)
+        self.__set_concurrency_value(selected_api)
 
         match selected_api:
             case 'YandexTranslator' | 'DeepLTranslator':
@@ -69,6 +83,18 @@ class SettingsWindow(QtWidgets.QDialog):
     def set_protection_symbol(self, symbol: str):
         self.__settings.set_protection_symbol(symbol)
 
+    def set_translation_concurrency(self, value: int):
+        self.__settings.set_translation_concurrency(self.__ui.apis_comboBox.currentText(), value)
+
+    def set_loading_processes(self, value: int):
+        self.__settings.set_loading_processes(value)
+
+    def set_file_processes(self, value: int):
+        self.__settings.set_file_processes(value)
+
+    def set_filter_vanilla_keys(self, value: bool):
+        self.__settings.set_filter_vanilla_keys(value)
+
     def set_default(self):
         self.__ui.apis_comboBox.setCurrentText('GoogleTranslator')
         self.__settings.set_translator_api('GoogleTranslator')
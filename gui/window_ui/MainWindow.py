@@ -152,6 +152,26 @@ class Ui_MainWindow(object):
         self.run_pushButton.setMinimumSize(QtCore.QSize(0, 50))
         self.run_pushButton.setObjectName("run_pushButton")
         self.gridLayout.addWidget(self.run_pushButton, 10, 7, 2, 1)
+        self.estimate_pushButton = QtWidgets.QPushButton(self.centralwidget)
+        self.estimate_pushButton.setEnabled(False)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.estimate_pushButton.sizePolicy().hasHeightForWidth())
+        self.estimate_pushButton.setSizePolicy(sizePolicy)
+        self.estimate_pushButton.setMinimumSize(QtCore.QSize(0, 25))
+        self.estimate_pushButton.setObjectName("estimate_pushButton")
+        self.gridLayout.addWidget(self.estimate_pushButton, 10, 6, 1, 1)
+        self.retry_pushButton = QtWidgets.QPushButton(self.centralwidget)
+        self.retry_pushButton.setEnabled(False)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.retry_pushButton.sizePolicy().hasHeightForWidth())
+        self.retry_pushButton.setSizePolicy(sizePolicy)
+        self.retry_pushButton.setMinimumSize(QtCore.QSize(0, 25))
+        self.retry_pushButton.setObjectName("retry_pushButton")
+        self.gridLayout.addWidget(self.retry_pushButton, 11, 6, 1, 1)
         self.selector_original_language_comboBox = QtWidgets.QComboBox(self.centralwidget)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Maximum)
         sizePolicy.setHorizontalStretch(0)
@@ -555,6 +575,8 @@ class Ui_MainWindow(object):
         self.program_version_label.setText(_translate("MainWindow", "Версия 000"))
         self.previous_directory_open_pushButton.setText(_translate("MainWindow", "Открыть"))
         self.run_pushButton.setText(_translate("MainWindow", "Старт"))
+        self.estimate_pushButton.setText(_translate("MainWindow", "Оценка"))
+        self.retry_pushButton.setText(_translate("MainWindow", "Повторить ошибки"))
         self.check_all_pushButton.setText(_translate("MainWindow", "Отметить все"))
         self.uncheck_all_pushButton.setText(_translate("MainWindow", "Снять все"))
         self.update_need_translation_area_pushButton.setText(_translate("MainWindow", "Обновить"))
@@ -14,7 +14,7 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 class Ui_Settings(object):
     def setupUi(self, Settings):
         Settings.setObjectName("Settings")
-        Settings.resize(730, 242)
+        Settings.resize(730, 330)
         self.gridLayout = QtWidgets.QGridLayout(Settings)
         self.gridLayout.setObjectName("gridLayout")
         self.save_settings_pushButton = QtWidgets.QPushButton(Settings)
@@ -26,7 +26,7 @@ class Ui_Settings(object):
         self.save_settings_pushButton.setMinimumSize(QtCore.QSize(75, 23))
         self.save_settings_pushButton.setMaximumSize(QtCore.QSize(75, 23))
         self.save_settings_pushButton.setObjectName("save_settings_pushButton")
-        self.gridLayout.addWidget(self.save_settings_pushButton, 5, 0, 1, 3, QtCore.Qt.AlignRight|QtCore.Qt.AlignBottom)
+        self.gridLayout.addWidget(self.save_settings_pushButton, 8, 0, 1, 3, QtCore.Qt.AlignRight|QtCore.Qt.AlignBottom)
         self.apis_comboBox = QtWidgets.QComboBox(Settings)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
         sizePolicy.setHorizontalStretch(0)
@@ -59,8 +59,47 @@ class Ui_Settings(object):
         self.protection_symbol_lineEdit.setObjectName("protection_symbol_lineEdit")
         self.horizontalLayout.addWidget(self.protection_symbol_lineEdit)
         self.gridLayout.addLayout(self.horizontalLayout, 1, 0, 1, 3)
+        self.concurrency_label = QtWidgets.QLabel(Settings)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.concurrency_label.setFont(font)
+        self.concurrency_label.setObjectName("concurrency_label")
+        self.gridLayout.addWidget(self.concurrency_label, 2, 0, 1, 1)
+        self.concurrency_spinBox = QtWidgets.QSpinBox(Settings)
+        self.concurrency_spinBox.setMinimum(1)
+        self.concurrency_spinBox.setMaximum(16)
+        self.concurrency_spinBox.setObjectName("concurrency_spinBox")
+        self.gridLayout.addWidget(self.concurrency_spinBox, 2, 2, 1, 1)
+        self.loading_processes_label = QtWidgets.QLabel(Settings)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.loading_processes_label.setFont(font)
+        self.loading_processes_label.setObjectName("loading_processes_label")
+        self.gridLayout.addWidget(self.loading_processes_label, 3, 0, 1, 1)
+        self.loading_processes_spinBox = QtWidgets.QSpinBox(Settings)
+        self.loading_processes_spinBox.setMinimum(1)
+        self.loading_processes_spinBox.setMaximum(16)
+        self.loading_processes_spinBox.setObjectName("loading_processes_spinBox")
+        self.gridLayout.addWidget(self.loading_processes_spinBox, 3, 2, 1, 1)
+        self.file_processes_label = QtWidgets.QLabel(Settings)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.file_processes_label.setFont(font)
+        self.file_processes_label.setObjectName("file_processes_label")
+        self.gridLayout.addWidget(self.file_processes_label, 4, 0, 1, 1)
+        self.file_processes_spinBox = QtWidgets.QSpinBox(Settings)
+        self.file_processes_spinBox.setMinimum(1)
+        self.file_processes_spinBox.setMaximum(16)
+        self.file_processes_spinBox.setObjectName("file_processes_spinBox")
+        self.gridLayout.addWidget(self.file_processes_spinBox, 4, 2, 1, 1)
+        self.filter_vanilla_keys_checkBox = QtWidgets.QCheckBox(Settings)
+        font = QtGui.QFont()
+        font.setPointSize(12)
+        self.filter_vanilla_keys_checkBox.setFont(font)
+        self.filter_vanilla_keys_checkBox.setObjectName("filter_vanilla_keys_checkBox")
+        self.gridLayout.addWidget(self.filter_vanilla_keys_checkBox, 5, 0, 1, 3)
         spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum)
-        self.gridLayout.addItem(spacerItem1, 2, 1, 3, 1)
+        self.gridLayout.addItem(spacerItem1, 6, 1, 2, 1)
 
         self.retranslateUi(Settings)
         QtCore.QMetaObject.connectSlotsByName(Settings)
@@ -71,3 +110,7 @@ class Ui_Settings(object):
         self.save_settings_pushButton.setText(_translate("Settings", "Сохранить"))
         self.apis_label.setText(_translate("Settings", "Сервис перевода"))
         self.protection_symbol_label.setText(_translate("Settings", "Символ для протекции"))
+        self.concurrency_label.setText(_translate("Settings", "Одновременных запросов"))
+        self.loading_processes_label.setText(_translate("Settings", "Процессов загрузки локализации"))
+        self.file_processes_label.setText(_translate("Settings", "Процессов подготовки файлов"))
+        self.filter_vanilla_keys_checkBox.setText(_translate("Settings", "Загружать из игры только ключи мода"))
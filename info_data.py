@@ -32,6 +32,10 @@ class FileInfoData:
             'name': StatWindowConstants.lines_from_previous_version,
             'value': []
         }
+        self.lines_with_changed_source = {
+            'name': StatWindowConstants.lines_with_changed_source,
+            'value': []
+        }
         self.lines_with_errors = {
             'name': StatWindowConstants.lines_with_errors,
             'value': []
@@ -59,6 +63,9 @@ class FileInfoData:
     def add_line_from_previous_version(self, line_number):
         self.lines_from_previous_version['value'].append(line_number + 1)
 
+    def add_line_with_changed_source(self, line_number):
+        self.lines_with_changed_source['value'].append(line_number + 1)
+
     def add_line_with_error(self, line_number):
         self.lines_with_errors['value'].append(line_number + 1)
 
@@ -69,12 +76,12 @@ class FileInfoData:
         return {'title': self.title,
                 'expanded_data': (self.used_api, self.lines_in_files, self.new_lines, self.translated_lines,
                                   self.lines_from_vanilla_loc, self.lines_from_previous_version,
-                                  self.lines_with_errors, self.process_time)}
+                                  self.lines_with_changed_source, self.lines_with_errors, self.process_time)}
 
     def get_file_data_for_csv(self):
         rows = [{'name': self.title}, self.used_api, self.lines_in_files, self.new_lines, self.translated_lines,
-                self.lines_from_vanilla_loc, self.lines_from_previous_version, self.lines_with_errors,
-                self.process_time, {'name': ''}]
+                self.lines_from_vanilla_loc, self.lines_from_previous_version, self.lines_with_changed_source,
+                self.lines_with_errors, self.process_time, {'name': ''}]
         return rows
 
 
@@ -87,6 +94,11 @@ class InfoData:
             'value': 0
         }
 
+        self.skipped_files = {
+            'name': StatWindowConstants.skipped_files,
+            'value': 0
+        }
+
         self.translated_chars = {
             'name': StatWindowConstants.translated_chars,
             'value': 0
@@ -97,7 +109,45 @@ class InfoData:
             'value': set()
         }
 
+        self.translation_memory_hits = {
+            'name': StatWindowConstants.translation_memory_hits,
+            'value': 0
+        }
+
+        self.translation_memory_misses = {
+            'name': StatWindowConstants.translation_memory_misses,
+            'value': 0
+        }
+
+        self.deduplicated_chars = {
+            'name': StatWindowConstants.deduplicated_chars,
+            'value': 0
+        }
+
+        self.translation_requests = {
+            'name': StatWindowConstants.translation_requests,
+            'value': 0
+        }
+
+        self.throttled_requests = {
+            'name': StatWindowConstants.throttled_requests,
+            'value': 0
+        }
+
+        self.request_rate = {
+            'name': StatWindowConstants.request_rate,
+            'value': ''
+        }
+
+        self.stage_timings = {
+            'name': StatWindowConstants.stage_timings,
+            'value': ''
+        }
+
         self.files_info = {}
+        # Скорость перевода в символах в секунду для каждого сервиса. Не выводится в статистике,
+        # а сохраняется в настройках для оценки времени следующих запусков
+        self.translation_throughput = {}
 
     def add_file_info(self, file_info: FileInfoData):
         self.files_info[file_info.title] = file_info
@@ -105,17 +155,135 @@ class InfoData:
     def add_translated_files(self):
         self.translated_files['value'] += 1
 
+    def add_skipped_files(self):
+        self.skipped_files['value'] += 1
+
     def add_translated_chars(self, chars):
         self.translated_chars['value'] += chars
 
     def add_api_service(self, api_name: str):
         self.used_api['value'].add(api_name)
 
+    def add_deduplicated_chars(self, chars):
+        self.deduplicated_chars['value'] += chars
+
+    def set_translation_memory_stats(self, hits: int, misses: int):
+        self.translation_memory_hits['value'] = hits
+        self.translation_memory_misses['value'] = misses
+
+    def set_request_stats(self, requests: int, throttled: int, rates: dict[str, float]):
+        self.translation_requests['value'] = requests
+        self.throttled_requests['value'] = throttled
+        self.request_rate['value'] = ', '.join(f'{api_name}: {rate:.2f}' for api_name, rate in rates.items())
+
+    def set_translation_throughput(self, throughput: dict[str, float]):
+        self.translation_throughput = throughput
+
+    def set_stage_timings(self, stages: list):
+        self.stage_timings['value'] = ', '.join(map(str, stages))
+
+    def get_data_for_general(self):
+        return {'title': self.title, 'expanded_data': (self.translated_files, self.skipped_files,
+                                                       self.translated_chars, self.used_api,
+                                                       self.translation_memory_hits, self.translation_memory_misses,
+                                                       self.deduplicated_chars, self.translation_requests,
+                                                       self.throttled_requests, self.request_rate,
+                                                       self.stage_timings)}
+
+    def get_data_for_csv(self):
+        rows = [{'name': self.title}, self.translated_files, self.skipped_files, self.translated_chars, self.used_api,
+                self.translation_memory_hits, self.translation_memory_misses, self.deduplicated_chars,
+                self.translation_requests, self.throttled_requests, self.request_rate, self.stage_timings,
+                {'name': ''}]
+        for file in self.files_info.values():
+            rows += file.get_file_data_for_csv()
+        return rows
+
+
+class FileEstimateData(FileInfoData):
+    r"""Данные пробного запуска по одному файлу: сколько строк и символов ушло бы сервису перевода"""
+
+    def __init__(self, filename: Path):
+        super(FileEstimateData, self).__init__(filename=filename)
+        self.lines_to_translate = {
+            'name': StatWindowConstants.lines_to_translate,
+            'value': 0
+        }
+        self.chars_to_translate = {
+            'name': StatWindowConstants.chars_to_translate,
+            'value': 0
+        }
+        self.memory_hit_lines = {
+            'name': StatWindowConstants.memory_hit_lines,
+            'value': 0
+        }
+
+    def add_estimated_lines(self, lines: int, chars: int, memory_hit: bool):
+        if memory_hit:
+            self.memory_hit_lines['value'] += lines
+        else:
+            self.lines_to_translate['value'] += lines
+            self.chars_to_translate['value'] += chars
+
+    def get_file_data(self):
+        return {'title': self.title,
+                'expanded_data': (self.lines_in_files, self.lines_from_vanilla_loc, self.lines_from_previous_version,
+                                  self.lines_to_translate, self.chars_to_translate, self.memory_hit_lines)}
+
+    def get_file_data_for_csv(self):
+        return [{'name': self.title}, *self.get_file_data()['expanded_data'], {'name': ''}]
+
+
+class EstimateData(InfoData):
+    r"""Итог пробного запуска: объем перевода, попадания в память переводов, остаток квоты и примерное время"""
+
+    def __init__(self, mod_name="Mod name"):
+        super(EstimateData, self).__init__(mod_name=mod_name)
+        self.lines_to_translate = {
+            'name': StatWindowConstants.lines_to_translate,
+            'value': 0
+        }
+        self.chars_to_translate = {
+            'name': StatWindowConstants.chars_to_translate,
+            'value': 0
+        }
+        self.memory_hit_lines = {
+            'name': StatWindowConstants.memory_hit_lines,
+            'value': 0
+        }
+        self.estimated_requests = {
+            'name': StatWindowConstants.estimated_requests,
+            'value': 0
+        }
+        self.remaining_quota = {
+            'name': StatWindowConstants.remaining_quota,
+            'value': ''
+        }
+        self.estimated_time = {
+            'name': StatWindowConstants.estimated_time,
+            'value': ''
+        }
+
+    def set_estimate(self, lines: int, chars: int, memory_hit_lines: int, deduplicated_chars: int, requests: int,
+                     remaining_quota: dict[str, int | None], estimated_time: str):
+        self.lines_to_translate['value'] = lines
+        self.chars_to_translate['value'] = chars
+        self.memory_hit_lines['value'] = memory_hit_lines
+        self.deduplicated_chars['value'] = deduplicated_chars
+        self.estimated_requests['value'] = requests
+        self.remaining_quota['value'] = ', '.join(f'{api_name}: {"-" if quota is None else quota}'
+                                                  for api_name, quota in remaining_quota.items())
+        self.estimated_time['value'] = estimated_time
+
     def get_data_for_general(self):
-        return {'title': self.title, 'expanded_data': (self.translated_files, self.translated_chars, self.used_api)}
+        return {'title': self.title, 'expanded_data': (self.used_api, self.skipped_files,
+                                                       self.lines_to_translate, self.chars_to_translate,
+                                                       self.memory_hit_lines, self.deduplicated_chars,
+                                                       self.estimated_requests, self.remaining_quota,
+                                                       self.estimated_time)}
 
     def get_data_for_csv(self):
-        rows = [{'name': self.title}, self.translated_files, self.translated_chars, self.used_api, {'name': ''}]
+        rows = [{'name': self.title}, *self.get_data_for_general()['expanded_data'], {'name': ''}]
         for file in self.files_info.values():
             rows += file.get_file_data_for_csv()
         return rows
@@ -18,6 +18,12 @@ class LanguageConstants:
     start_forming_hierarchy = ''
     start_file_processing = ''
     file_opened = ''
+    file_skipped = ''
+    file_resumed = ''
+    retry_failed_started = ''
+    retry_file_changed = ''
+    resume_title = ''
+    resume_question = ''
     forming_process = ''
     folder_created = ''
     error_with_data_processing = ''
@@ -34,6 +40,10 @@ class LanguageConstants:
     previous_localization_dict_creating_started = ''
     previous_localization_processing = ''
     process_string = ''
+    remaining_time = ''
+    translation_planning_started = ''
+    unique_lines_translation = ''
+    estimation_started = ''
     final = ''
     final_time = ''
 
@@ -81,6 +91,14 @@ class LanguageConstants:
         cls.start_forming_hierarchy = _translate("Constants", "Начато формирование иерархии директорий -")
         cls.start_file_processing = _translate("Constants", "Начата обработка файлов")
         cls.file_opened = _translate("Constants", "Начата работа с файлом")
+        cls.file_skipped = _translate("Constants", "Файл не изменился с прошлого запуска, пропущен")
+        cls.file_resumed = _translate("Constants", "Файл обработан до прерывания, пропущен")
+        cls.retry_failed_started = _translate("Constants", "Начат повторный перевод строк с ошибками")
+        cls.retry_file_changed = _translate("Constants", "Исходный файл изменился после перевода, "
+                                                         "повторный перевод пропущен:")
+        cls.resume_title = _translate("Constants", "Продолжение перевода")
+        cls.resume_question = _translate("Constants", "Предыдущий запуск в эту папку был прерван. "
+                                                      "Продолжить с последней контрольной точки?")
         cls.forming_process = _translate("Constants", "Формирую иерархию\nдиректорий")
         cls.error_with_data_processing = _translate("Constants", "Произошла ошибка")
         cls.folder_created = _translate("Constants", "Создана папка")
@@ -98,6 +116,10 @@ class LanguageConstants:
                                                                      "Начато создание словаря предыдущей локализации")
         cls.previous_localization_processing = _translate("Constants", "Обработка предыдущей локализации")
         cls.process_string = _translate("Constants", "Обработка строки")
+        cls.remaining_time = _translate("Constants", "Осталось примерно")
+        cls.translation_planning_started = _translate("Constants", "Начат поиск повторяющихся строк")
+        cls.unique_lines_translation = _translate("Constants", "Перевод уникальных строк")
+        cls.estimation_started = _translate("Constants", "Начата оценка объема перевода")
         cls.final = _translate("Constants", "Обработка данных закончена")
         cls.final_time = _translate("Constants", "Программа закончила свою работу за")
 
@@ -134,11 +156,26 @@ class StatWindowConstants:
     translated_lines = ''
     lines_from_vanilla = ''
     lines_from_previous_version = ''
+    lines_with_changed_source = ''
     lines_with_errors = ''
     time_of_process = ''
 
     translated_files = ''
+    skipped_files = ''
     translated_chars = ''
+    translation_memory_hits = ''
+    translation_memory_misses = ''
+    deduplicated_chars = ''
+    translation_requests = ''
+    throttled_requests = ''
+    request_rate = ''
+    stage_timings = ''
+    lines_to_translate = ''
+    chars_to_translate = ''
+    memory_hit_lines = ''
+    estimated_requests = ''
+    remaining_quota = ''
+    estimated_time = ''
 
     name_column_param = ''
     name_column_value = ''
@@ -158,11 +195,26 @@ class StatWindowConstants:
         cls.translated_lines = _translate("StatWindow", "Список переведенных строк")
         cls.lines_from_vanilla = _translate("StatWindow", "Список строк из ваниллы")
         cls.lines_from_previous_version = _translate("StatWindow", "Список строк из предыдущей версии перевода")
+        cls.lines_with_changed_source = _translate("StatWindow", "Строки, исходный текст которых изменился")
         cls.lines_with_errors = _translate("StatWindow", "Ошибки перевода в строках")
         cls.time_of_process = _translate("StatWindow", "Время выполнения")
 
         cls.translated_files = _translate("StatWindow", "Переведено файлов")
+        cls.skipped_files = _translate("StatWindow", "Пропущено неизменившихся файлов")
         cls.translated_chars = _translate("StatWindow", "Переведено символов")
+        cls.translation_memory_hits = _translate("StatWindow", "Строк взято из памяти переводов")
+        cls.translation_memory_misses = _translate("StatWindow", "Строк не найдено в памяти переводов")
+        cls.deduplicated_chars = _translate("StatWindow", "Символов сэкономлено на повторяющихся строках")
+        cls.translation_requests = _translate("StatWindow", "Запросов к сервисам перевода")
+        cls.throttled_requests = _translate("StatWindow", "Запросов отклонено из-за ограничения частоты")
+        cls.request_rate = _translate("StatWindow", "Запросов в секунду")
+        cls.stage_timings = _translate("StatWindow", "Этапы обработки файлов: работа / простой")
+        cls.lines_to_translate = _translate("StatWindow", "Строк будет отправлено на перевод")
+        cls.chars_to_translate = _translate("StatWindow", "Символов будет отправлено на перевод")
+        cls.memory_hit_lines = _translate("StatWindow", "Строк найдено в памяти переводов")
+        cls.estimated_requests = _translate("StatWindow", "Примерное количество запросов")
+        cls.remaining_quota = _translate("StatWindow", "Остаток квоты, символов")
+        cls.estimated_time = _translate("StatWindow", "Примерное время перевода")
 
         cls.name_column_param = _translate("StatWindow", "Показатель")
         cls.name_column_value = _translate("StatWindow", "Значение")
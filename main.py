@@ -1,6 +1,12 @@
 import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import suppress
+from functools import wraps
 from pathlib import Path
+from queue import Empty, Queue
 import re
+import threading
 import time
 from typing import KeysView
 
@@ -8,14 +14,22 @@ from PyQt5.QtCore import QObject, pyqtSignal
 from deep_translator import GoogleTranslator
 from deepl import QuotaExceededException
 
-from info_data import InfoData, FileInfoData
+from build_manifest import BuildManifest, CheckpointJournal, SourceSnapshot
+from file_writer import AtomicFileWriter
+from info_data import InfoData, FileInfoData, EstimateData, FileEstimateData
 from languages.language_constants import LanguageConstants
 
 from loguru import logger
 
-from parsers.modern_paradox_parser import ModernParadoxParser
+from parsers.localization_index import LocalizationIndex
+from parsers.modern_paradox_parser import ModernParadoxParser, LocalizationEntry
+from pipeline import QueuedFileWriter, StageTimer
 from settings import BASE_DIR
-from shielded_values import ShieldedValues
+from shielded_values import ShieldedValues, ShieldingEngine
+from translators.async_translator import AsyncTranslator, TranslationCancelledError
+from translators.rate_limiter import RateLimiter
+from translators.translation_memory import TranslationMemory
+from translators.translation_scheduler import TranslationScheduler
 from translators.translator_manager import TranslatorManager
 
 
@@ -118,6 +132,19 @@ class Prepper:
                 Названия файлов не изменены под новый(target_language) язык"""
         return self._file_hierarchy
 
+    @logger.catch()
+    def get_localization_keys(self) -> set:
+        r"""Возвращает множество всех ключей, встречающихся в файлах мода из get_file_hierarchy()"""
+        keys = set()
+        for file in self._file_hierarchy:
+            try:
+                keys.update(entry.key for entry in
+                            ModernParadoxParser(filename=self._original_mode_path / file).iter_entries())
+            except Exception as error:
+                # Такой файл не удастся и обработать, его ошибка будет показана при обработке
+                logger.warning(f'Failed to read keys of {file}: {error}')
+        return keys
+
     @logger.catch()
     def get_previous_files(self, target_language: str):
         self._previous_files = []
@@ -191,6 +218,27 @@ class Settings:
 
         'translator_api': "GoogleTranslator",
         'protection_symbol': "☻",
+        'loading_processes': 1,
+        'file_processes': 1,
+        'pipeline_processing': True,
+        'filter_vanilla_keys': False,
+        'google_batch_translation': True,
+        'deduplicate_translations': True,
+        'incremental_build': True,
+        'performance_logging': False,
+        'translation_concurrency': {
+            'GoogleTranslator': 2,
+            'DeepLTranslator': 4,
+        },
+        'async_translation': False,
+        'request_rates': {
+            'GoogleTranslator': 5,
+            'DeepLTranslator': 10,
+        },
+        'translation_throughput': {
+            'GoogleTranslator': 1500,
+            'DeepLTranslator': 4000,
+        },
 
         'app_language': "Русский",
         'games': {},
@@ -222,6 +270,9 @@ class Settings:
         with game_supported_languages.open(mode='r', encoding='utf-8-sig') as file:
             self.__settings['games'] = json.load(file)
 
+    def get_local_data_path(self) -> Path | None:
+        return self.__local_data_path
+
     def get_games(self) -> KeysView:
         return self.__settings.get('games').keys()
 
@@ -274,6 +325,42 @@ class Settings:
     def set_protection_symbol(self, symbol):
         self.__settings['protection_symbol'] = symbol
 
+    def set_loading_processes(self, processes: int):
+        self.__settings['loading_processes'] = processes
+
+    def set_file_processes(self, processes: int):
+        self.__settings['file_processes'] = processes
+
+    def set_pipeline_processing(self, value: bool):
+        self.__settings['pipeline_processing'] = value
+
+    def set_filter_vanilla_keys(self, value: bool):
+        self.__settings['filter_vanilla_keys'] = value
+
+    def set_google_batch_translation(self, value: bool):
+        self.__settings['google_batch_translation'] = value
+
+    def set_deduplicate_translations(self, value: bool):
+        self.__settings['deduplicate_translations'] = value
+
+    def set_incremental_build(self, value: bool):
+        self.__settings['incremental_build'] = value
+
+    def set_performance_logging(self, value: bool):
+        self.__settings['performance_logging'] = value
+
+    def set_translation_concurrency(self, api_service: str, value: int):
+        self.__settings['translation_concurrency'] = self.get_translation_concurrency() | {api_service: value}
+
+    def set_async_translation(self, value: bool):
+        self.__settings['async_translation'] = value
+
+    def set_request_rate(self, api_service: str, value: float):
+        self.__settings['request_rates'] = self.get_request_rates() | {api_service: value}
+
+    def set_translation_throughput(self, throughput: dict):
+        self.__settings['translation_throughput'] = self.get_translation_throughput() | throughput
+
     def set_app_language(self, value):
         self.__settings['app_language'] = value
 
@@ -301,6 +388,42 @@ class Settings:
     def get_protection_symbol(self):
         return self.__settings.get('protection_symbol', None)
 
+    def get_loading_processes(self) -> int:
+        return self.__settings.get('loading_processes', 1)
+
+    def get_file_processes(self) -> int:
+        return self.__settings.get('file_processes', 1)
+
+    def get_pipeline_processing(self) -> bool:
+        return self.__settings.get('pipeline_processing', True)
+
+    def get_filter_vanilla_keys(self) -> bool:
+        return self.__settings.get('filter_vanilla_keys', False)
+
+    def get_google_batch_translation(self) -> bool:
+        return self.__settings.get('google_batch_translation', True)
+
+    def get_deduplicate_translations(self) -> bool:
+        return self.__settings.get('deduplicate_translations', True)
+
+    def get_incremental_build(self) -> bool:
+        return self.__settings.get('incremental_build', True)
+
+    def get_performance_logging(self) -> bool:
+        return self.__settings.get('performance_logging', False)
+
+    def get_translation_concurrency(self) -> dict:
+        return self.__settings.get('translation_concurrency', {})
+
+    def get_async_translation(self) -> bool:
+        return self.__settings.get('async_translation', False)
+
+    def get_request_rates(self) -> dict:
+        return self.__settings.get('request_rates', {})
+
+    def get_translation_throughput(self) -> dict:
+        return self.__settings.get('translation_throughput', {})
+
     def get_app_language(self):
         return self.__settings.get('app_language', 0)
 
@@ -338,6 +461,20 @@ class TranslatorAccount:
             json.dump(self.__translator_accounts, accounts, indent=4)
 
 
+def _catch_line_errors(method):
+    r"""Декоратор методов, вызываемых для каждой строки файла. Без режима производительности каждый вызов
+    идет под собственным перехватом исключений, в режиме производительности (self._log_lines выключен)
+    метод вызывается напрямую, а исключения перехватываются на уровне файла"""
+    caught_method = logger.catch(exclude=TranslationCancelledError)(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._log_lines:
+            return caught_method(self, *args, **kwargs)
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
 class BasePerformer(QObject):
     info_data: InfoData
     file_info_data: FileInfoData
@@ -346,6 +483,9 @@ class BasePerformer(QObject):
     info_label_value = pyqtSignal(str)
     progress_bar_value = pyqtSignal(float)
     finish_thread = pyqtSignal(InfoData)
+    progress_interval = 0.2
+    # Сколько файлов может ждать следующего этапа конвейера обработки
+    pipeline_queue_size = 2
 
     @logger.catch()
     def __init__(
@@ -357,18 +497,64 @@ class BasePerformer(QObject):
             need_translate: bool = False,
             need_translate_tuple: tuple | None = None,
             disable_original_line: bool = False,
-            protection_symbol: str = "☻"
+            protection_symbol: str = "☻",
+            localization_index_path: Path | None = None,
+            loading_processes: int = 1,
+            filter_vanilla_keys: bool = False,
+            translation_memory_path: Path | None = None,
+            deduplicate_translations: bool = False,
+            translation_concurrency: dict | None = None,
+            async_translation: bool = False,
+            request_rates: dict | None = None,
+            dry_run: bool = False,
+            translation_throughput: dict | None = None,
+            incremental_build: bool = False,
+            resume: bool = False,
+            retry_failed: bool = False,
+            performance_logging: bool = False,
+            file_processes: int = 1,
+            pipeline_processing: bool = False,
     ):
         super(BasePerformer, self).__init__()
         self._paths = paths
         self._original_language = original_language
         self._target_language = target_language
         self._translator = translator
+        self._scheduler = TranslationScheduler(translator)
         self._need_translate_list = need_translate_tuple if need_translate is True else tuple()
         self._disable_original_line = disable_original_line
         self._protection_symbol = protection_symbol
+        self._loading_processes = loading_processes
+        self._filter_vanilla_keys = filter_vanilla_keys
+        self._translation_memory = TranslationMemory(database_path=translation_memory_path)
+        self._deduplicate_translations = deduplicate_translations
+        self._translation_concurrency = translation_concurrency or {}
+        self._async_translator = AsyncTranslator() if async_translation else None
+        self._request_rates = request_rates or {}
+        self._rate_limiters: dict[str, RateLimiter] = {}
+        self._dry_run = dry_run
+        self._translation_throughput = translation_throughput or {}
+        # Для каждого сервиса: [отправлено символов, секунд ожидания ответа]
+        self._measured_translation: dict[str, list] = {}
+        self._build_manifest = BuildManifest(paths.get_target_path()) if incremental_build else None
+        self._source_hashes: dict[Path, str] = {}
+        self._unchanged_files: dict[Path, bool] = {}
+        self._source_snapshot = SourceSnapshot(paths.get_target_path())
+        self._previous_sources: dict[str, str] = {}
+        self._checkpoint_journal = CheckpointJournal(paths.get_target_path())
+        self._resume = resume
+        self._retry_failed = retry_failed
+        self._cancelled = False
+        self._log_lines = not performance_logging
+        self._file_processes = file_processes
+        self._pipeline_processing = pipeline_processing
+        # Сервис, для которого экранируются строки, когда объект подготавливает файлы в пуле процессов
+        self._prepared_api_service: str | None = None
+        self._localization_index = LocalizationIndex(index_directory=localization_index_path,
+                                                     workers=loading_processes)
 
         self._shielded_values = ShieldedValues.get_common_pattern()
+        self._shielding = ShieldingEngine(pattern=self._shielded_values, protection_symbol=protection_symbol)
 
         self._start_running_time = None
         self._original_language_list = {}
@@ -379,6 +565,12 @@ class BasePerformer(QObject):
         self._previous_version_dictionary = {}
         self._modified_values = {}
         self._translated_list = []
+        self._pending_translations = []
+        self._processing_start_time = None
+        self._progress_time = 0.0
+        self._unsent_progress = 0.0
+        self._processed_chars = 0.0
+        self._skipped_chars = 0.0
 
     @logger.catch()
     def _calculate_time_delta(self, start_time: float = None) -> str:
@@ -388,6 +580,34 @@ class BasePerformer(QObject):
         delta = current_time - start_time
         return time.strftime('%H:%M:%S', time.gmtime(delta))
 
+    def _add_progress(self, chars: float, status: str | None = None, skipped: bool = False, force: bool = False):
+        r"""Учитывает обработку chars символов исходных файлов (по размеру файла) и не чаще раза
+        в progress_interval секунд отправляет интерфейсу накопленный прогресс и состояние с оставшимся временем.
+        Сигнал на каждую строку заваливал очередь событий интерфейса на больших модах.
+        Оставшееся время считается по скорости обработки символов, пропущенные файлы в скорость не входят"""
+        if self._processing_start_time is None:
+            self._processing_start_time = time.monotonic()
+        if skipped:
+            self._skipped_chars += chars
+        else:
+            self._processed_chars += chars
+        self._unsent_progress += chars
+        now = time.monotonic()
+        if not force and now - self._progress_time < self.progress_interval:
+            return
+        self._progress_time = now
+        self.progress_bar_value.emit(self._unsent_progress / self._paths.get_original_files_size())
+        self._unsent_progress = 0.0
+        if status is not None:
+            self.info_label_value.emit(f'{status}\n{LanguageConstants.remaining_time} {self._get_remaining_time()}')
+
+    def _get_remaining_time(self) -> str:
+        elapsed = time.monotonic() - self._processing_start_time
+        if not self._processed_chars or elapsed <= 0:
+            return '-'
+        remaining_chars = self._paths.get_original_files_size() - self._processed_chars - self._skipped_chars
+        return time.strftime('%H:%M:%S', time.gmtime(max(0.0, remaining_chars) * elapsed / self._processed_chars))
+
     @logger.catch()
     def _create_directory_hierarchy(self):
         info = f"{LanguageConstants.start_forming_hierarchy} {self._calculate_time_delta()}\n"
@@ -407,6 +627,10 @@ class BasePerformer(QObject):
                     (self._paths.get_target_path() / directory).mkdir(parents=True)
                     info = f"{LanguageConstants.folder_created} {directory} - {self._calculate_time_delta()}\n"
                     self.info_console_value.emit(info)
+                target_file = self._paths.get_target_path() / str(file).replace(self._original_language,
+                                                                                 self._target_language)
+                if AtomicFileWriter.remove_stale_file(target_file):
+                    logger.info(f'Removed stale temporary file of {target_file}')
             except Exception as error:
                 error_text = f"{LanguageConstants.error_with_folder_creating} {directory}:" \
                              f"{error}"
@@ -416,10 +640,9 @@ class BasePerformer(QObject):
 
     @logger.catch()
     def _create_original_language_dictionary(self):
-        r"""Создает словарь, состоящий из номера строки, в качестве ключа и словаря, в качестве значения
-        Каждый словарь содержит пару ключ-значение: key: 'key', value: 'value'
-        К применру: 11: {'key': 'AI_UNIT_TOOLTIP_UNIT_STACK_NO_ORDER:0',
-                        'value': '" No order."'},
+        r"""Создает список записей LocalizationEntry, в котором индекс записи совпадает с номером строки файла
+        Каждая запись содержит пару ключ-значение: key, value
+        К применру: [11] LocalizationEntry(key='AI_UNIT_TOOLTIP_UNIT_STACK_NO_ORDER:', value='" No order."')
         Здесь 11 - номер строки, а key - ключ(идентификатор) полной строки value.
         А также в value уже обрезаны пробелы и  символы переноса строки справа"""
         pass
@@ -436,50 +659,38 @@ class BasePerformer(QObject):
     def _create_previous_version_dictionary(self):
         pass
 
-    @logger.catch()
-    def _create_translated_list(self, line_number: int, key_value: dict):
+    def _create_translated_list(self, line_number: int, key_value: LocalizationEntry):
         pass
 
-    @logger.catch()
-    def _compare_with_previous(self, key_value) -> str:
+    def _compare_with_previous(self, key_value: LocalizationEntry) -> str:
         pass
 
-    @logger.catch()
-    def _compare_with_vanilla(self, key_value: dict) -> str:
+    def _compare_with_vanilla(self, key_value: LocalizationEntry) -> str:
         pass
 
-    @logger.catch()
-    def _translate_line(self, translator: GoogleTranslator | None, key_value: dict) -> str:
+    def _translate_line(self, translator: GoogleTranslator | None, key_value: LocalizationEntry) -> str:
         pass
 
-    @logger.catch()
-    def _modify_line(self, line: str, pattern: str | None = r"\[.*?\]", flag: str | None = None) -> str | None:
+    @_catch_line_errors
+    def _modify_line(self, line: str, pattern: str | None = r"\[.*?\]", flag: str | None = None,
+                     api_service: str | None = None, modified_values: dict | None = None) -> str | None:
         r"""При флаге "modify" позволяет заменить некоторые части строки по шаблону на скрытую, ничего не обозначающую
-        переменную. При флаге "return_normal_view" позволяет вернуть нормальный вид строки по словарю параметров"""
+        переменную. При флаге "return_normal_view" позволяет вернуть нормальный вид строки по словарю параметров.
+        api_service - сервис, для которого экранируется строка или который вернул перевод, по умолчанию текущий.
+        modified_values - словарь параметров строки, по умолчанию полученный при последнем флаге modify"""
+        api_service = api_service or self._translator.get_api_name()
+        shielding = self._shielding if pattern == self._shielding.pattern.pattern \
+            else ShieldingEngine(pattern=pattern, protection_symbol=self._protection_symbol)
         match flag:
             case "modify":
-                self._modified_values = {}
-                shadow_number = 0
-                regular_groups = re.findall(pattern=pattern, string=line)
-                logger.debug(f'Found params for modify - {regular_groups}')
-                if regular_groups:
-                    for step in regular_groups:
-                        self._modified_values[shadow_number] = step
-                        if self._translator == "GoogleTranslator":
-                            line = line.replace(step, f"{self._protection_symbol}_{shadow_number}")
-                        elif self._translator == "DeepLTranslator":
-                            line = line.replace(step, f'<span translate="no">{step}</span>')
-                        shadow_number += 1
+                line, self._modified_values = shielding.shield(line, api_service)
+                if self._log_lines:
+                    logger.debug(f'Found params for modify - {list(self._modified_values.values())}')
                 return line
             case "return_normal_view":
-                if self._translator == "GoogleTranslator":
-                    for key, value in self._modified_values.items():
-                        line = line.replace(f'☻_{key}', value)
-                if self._translator == "DeepLTranslator":
-                    tags = re.findall(pattern=r'(<[^>]*translate=\"no\"[^>]*>).*?(<[^>]*>)', string=line)
-                    for open_tag, close_tag in tags:
-                        line = line.replace(open_tag, '').replace(close_tag, '')
-                return line
+                if modified_values is None:
+                    modified_values = self._modified_values
+                return shielding.restore(line, modified_values, api_service)
             case _:
                 self.info_console_value(LanguageConstants.error_with_modification)
                 self.finish_thread.emit()
@@ -495,6 +706,21 @@ class BasePerformer(QObject):
             case 'orange':
                 return f'<span style=\" color: orange;\">' + text + '</span>'
 
+    @logger.catch()
+    def _plan_translations(self):
+        r"""Предварительный проход по всем файлам, в котором одинаковые строки переводятся только один раз"""
+        pass
+
+    @logger.catch()
+    def _estimate_translations(self):
+        r"""Пробный запуск без обращения к сервису перевода и без записи файлов"""
+        pass
+
+    @logger.catch()
+    def _retry_failed_lines(self):
+        r"""Повторно переводит только строки с ошибкой перевода в уже готовых файлах целевой папки"""
+        pass
+
     @logger.catch()
     def _process_data(self):
         r"""Здесь происходит процесс обработки файлов. Последовательное открытие, создание и запись"""
@@ -503,34 +729,90 @@ class BasePerformer(QObject):
     def run(self):
         logger.info(f'Process start')
         self._start_running_time = time.time()
-        self._create_directory_hierarchy()
+        self.info_data = InfoData(self._paths.get_target_path().name)
+        if not self._dry_run:
+            self._create_directory_hierarchy()
         self._create_game_localization_dictionary()
         if self._paths.get_previous_path_validate_result():
             self._create_previous_version_dictionary()
-        self._process_data()
+        if self._build_manifest is not None:
+            self._build_manifest.load()
+        self._source_snapshot.load()
+        if self._need_translate_list:
+            self._scheduler.read_budgets()
+        if self._resume:
+            self._checkpoint_journal.load()
+        if self._dry_run:
+            self._estimate_translations()
+        elif self._retry_failed:
+            with suppress(TranslationCancelledError):
+                self._retry_failed_lines()
+            if self._build_manifest is not None:
+                self._build_manifest.save()
+            self._source_snapshot.save()
+        else:
+            self._checkpoint_journal.open(resume=self._resume)
+            with suppress(TranslationCancelledError):
+                if self._deduplicate_translations and self._need_translate_list:
+                    self._plan_translations()
+                self._process_data()
+            if self._build_manifest is not None:
+                self._build_manifest.save()
+            self._source_snapshot.retain(self._paths.get_file_hierarchy())
+            self._source_snapshot.save()
+            self._checkpoint_journal.close(completed=not self._cancelled and all(
+                self._checkpoint_journal.is_finished(file) for file in self._paths.get_file_hierarchy()))
+        self._translation_memory.close()
+        if self._async_translator is not None:
+            self._async_translator.close()
+        self.info_data.set_translation_memory_stats(hits=self._translation_memory.hits,
+                                                    misses=self._translation_memory.misses)
+        self.info_data.set_request_stats(
+            requests=sum(limiter.requests for limiter in self._rate_limiters.values()),
+            throttled=sum(limiter.throttled for limiter in self._rate_limiters.values()),
+            rates={api_name: limiter.get_effective_rate() for api_name, limiter in self._rate_limiters.items()})
+        self.info_data.set_translation_throughput({api_name: chars / seconds for api_name, (chars, seconds)
+                                                   in self._measured_translation.items() if seconds > 0})
         info = f"{LanguageConstants.final_time} {self._calculate_time_delta()}"
         self.info_console_value.emit(self._change_text_style(info, 'orange'))
         self.info_label_value.emit(LanguageConstants.final)
         self.finish_thread.emit(self.info_data)
 
+    def cancel_translation(self):
+        r"""Останавливает перевод: запросы в работе прерываются, а обработка завершается на текущем файле,
+        не записывая его. Уже записанные файлы остаются в журнале контрольных точек. Вызывается из потока интерфейса"""
+        logger.info('Translation cancelled')
+        self._cancelled = True
+        if self._async_translator is not None:
+            self._async_translator.cancel()
+
 
 class ModernParadoxGamesPerformer(BasePerformer):
+    error_marker = '#Translation Error!'
 
     def __init__(self, *args, **kwargs):
         super(ModernParadoxGamesPerformer, self).__init__(*args, **kwargs)
         self._default_padding = 1
+        self._planning = False
+        self._planned_texts = {}
+        self._planned_sources = {}
+        # Исходное значение строки -> текст, экранированный для сервиса, активного при планировании.
+        # Если к основной обработке сервис сменился (кончилась квота), строка экранируется уже иначе,
+        # и найти результат планирования можно только по исходному значению
+        self._planned_keys = {}
+        self._planned_translations = {}
+        self._planned_errors = {}
+        # Последняя строка отдана планированию или взята из его результата: ее прогресс учтен при планировании
+        self._planned_line = False
 
-    @logger.catch()
     def _create_original_language_dictionary(self, filename):
-        r"""Создает словарь, состоящий из номера строки, в качестве ключа и словаря, в качестве значения
-        Каждый словарь содержит пару ключ-значение: key: 'key', value: 'value'
-        К применру: 11: {'key': 'AI_UNIT_TOOLTIP_UNIT_STACK_NO_ORDER:0',
-                        'value': " No order."'},
+        r"""Создает список записей LocalizationEntry, в котором индекс записи совпадает с номером строки файла
+        Каждая запись содержит пару ключ-значение: key, value
+        К применру: [11] LocalizationEntry(key='AI_UNIT_TOOLTIP_UNIT_STACK_NO_ORDER:', value='" No order."')
         Здесь 11 - номер строки, а key - ключ(идентификатор) полной строки value.
         А также в value уже обрезаны пробелы и  символы переноса строки справа"""
-        self._original_language_list = []
-        self._original_language_list = ModernParadoxParser(filename=filename).parse_file(get_list=True)
-        logger.info(f'List with key_value: {self._original_language_list}')
+        self._original_language_list = list(ModernParadoxParser(filename=filename).iter_entries())
+        logger.opt(lazy=True).debug('List with key_value: {}', lambda: self._original_language_list)
         self._translated_list = ['' for _ in range(len(self._original_language_list))]
 
     @logger.catch()
@@ -538,14 +820,11 @@ class ModernParadoxGamesPerformer(BasePerformer):
         self.info_console_value.emit(f'{LanguageConstants.localization_dict_creating_started}'
                                      f' - {self._calculate_time_delta()}\n')
         self.info_label_value.emit(LanguageConstants.game_localization_processing)
-        original_vanilla_path = self._paths.get_game_path() / self._original_language
-        target_vanilla_path = self._paths.get_game_path() / self._target_language
-        for file in original_vanilla_path.rglob('*'):
-            lines_dictionary = ModernParadoxParser(filename=file).parse_file()
-            self._original_vanilla_dictionary |= lines_dictionary
-        for file in target_vanilla_path.rglob('*'):
-            lines_dictionary = ModernParadoxParser(filename=file).parse_file()
-            self._target_vanilla_dictionary |= lines_dictionary
+        mod_keys = self._paths.get_localization_keys() if self._filter_vanilla_keys else None
+        self._original_vanilla_dictionary = self._localization_index.get_localization_dictionary(
+            game_path=self._paths.get_game_path(), language=self._original_language, keys=mod_keys)
+        self._target_vanilla_dictionary = self._localization_index.get_localization_dictionary(
+            game_path=self._paths.get_game_path(), language=self._target_language, keys=mod_keys)
 
     @logger.catch()
     def _create_previous_version_dictionary(self):
@@ -553,12 +832,16 @@ class ModernParadoxGamesPerformer(BasePerformer):
                                      f' {self._calculate_time_delta()}\n')
         self.info_label_value.emit(LanguageConstants.previous_localization_processing)
         self._previous_version_dictionary = {"lang": "l_" + self._target_language + ":\n"}
-        for file in self._paths.get_previous_files(target_language=self._target_language):
-            file: Path
-            self._previous_version_dictionary |= ModernParadoxParser(filename=file).parse_file()
-
-    @logger.catch()
-    def _create_translated_list(self, key_value: dict):
+        previous_files = self._paths.get_previous_files(target_language=self._target_language)
+        for lines_dictionary in ModernParadoxParser.parse_files(previous_files, workers=self._loading_processes):
+            self._previous_version_dictionary.update(lines_dictionary)
+        previous_snapshot = SourceSnapshot(self._paths.get_previous_path())
+        previous_snapshot.load()
+        self._previous_sources = previous_snapshot.get_sources()
+        logger.info(f'Previous version source snapshot: {len(self._previous_sources)} keys')
+
+    @_catch_line_errors
+    def _create_translated_list(self, key_value: LocalizationEntry):
         if self._current_line_number == 0:
             self._translated_list[0] = "l_" + self._target_language + ":\n"
         else:
@@ -570,118 +853,992 @@ class ModernParadoxGamesPerformer(BasePerformer):
                     self._translated_list[self._current_line_number] = " " * self._default_padding \
                                                          + self._compare_with_vanilla(key_value=key_value) + "\n"
 
-    @logger.catch()
-    def _compare_with_previous(self, key_value) -> str:
-        previous_line = self._previous_version_dictionary.get(key_value['key'], '')
+    @_catch_line_errors
+    def _compare_with_previous(self, key_value: LocalizationEntry) -> str:
+        previous_line = self._previous_version_dictionary.get(key_value.key, '')
         if not previous_line.strip():
             previous_line = None
-        logger.debug(f'Key - Value: {key_value}')
+        if self._log_lines:
+            logger.debug(f'Key - Value: {key_value}')
+        if previous_line is not None and self._previous_sources.get(key_value.key, key_value.value) != key_value.value:
+            # Перевод из предыдущей версии сделан с другого исходного текста, поэтому строка переводится заново
+            if self._log_lines:
+                logger.debug(f'Source text changed since previous version')
+            self.file_info_data.add_line_with_changed_source(self._current_line_number)
+            return self._compare_with_vanilla(key_value=key_value)
         if previous_line is None:
-            if not key_value['value'] in ["", None]:
+            if not key_value.value in ["", None]:
                 self.file_info_data.add_new_line(self._current_line_number)
-            logger.debug(f'Previous is {previous_line} if line is {key_value["value"]}')
+            if self._log_lines:
+                logger.debug(f'Previous is {previous_line} if line is {key_value.value}')
             return self._compare_with_vanilla(key_value=key_value)
         else:
             self.file_info_data.add_line_from_previous_version(self._current_line_number)
-            return " ".join((key_value['key'], previous_line))
-
-    @logger.catch()
-    def _compare_with_vanilla(self, key_value: dict) -> str:
-        original_vanilla_value = self._original_vanilla_dictionary.get(key_value["key"], None)
-        target_vanilla_value = self._target_vanilla_dictionary.get(key_value["key"], None)
-        logger.debug(f'Original value - {"found" if original_vanilla_value is not None else None}, '
-                     f'Target value - {"found" if target_vanilla_value is not None else None} ')
+            return " ".join((key_value.key, previous_line))
+
+    @_catch_line_errors
+    def _compare_with_vanilla(self, key_value: LocalizationEntry) -> str:
+        original_vanilla_value = self._original_vanilla_dictionary.get(key_value.key, None)
+        target_vanilla_value = self._target_vanilla_dictionary.get(key_value.key, None)
+        if self._log_lines:
+            logger.debug(f'Original value - {"found" if original_vanilla_value is not None else None}, '
+                         f'Target value - {"found" if target_vanilla_value is not None else None} ')
         if original_vanilla_value is not None and target_vanilla_value is not None:
-            if original_vanilla_value == key_value["value"]:
-                logger.debug(f'Return vanilla value')
+            if original_vanilla_value == key_value.value:
+                if self._log_lines:
+                    logger.debug(f'Return vanilla value')
                 self.file_info_data.add_line_from_vanilla_loc(self._current_line_number)
-                return " ".join((key_value["key"], target_vanilla_value))
-        if key_value["value"] in ["", None]:
-            logger.debug('String is empty')
-            return " ".join((key_value["key"], key_value["value"]))
+                return " ".join((key_value.key, target_vanilla_value))
+        if key_value.value in ["", None]:
+            if self._log_lines:
+                logger.debug('String is empty')
+            return " ".join((key_value.key, key_value.value))
         else:
             return self._translate_line(translator=self._translator, key_value=key_value)
 
-    @logger.catch()
-    def _translate_line(self, translator: TranslatorManager | None, key_value: dict) -> str:
+    @_catch_line_errors
+    def _translate_line(self, translator: TranslatorManager | None, key_value: LocalizationEntry) -> str:
         r"""На вход должна подаваться строка с уже обрезанным символом переноса строки"""
         if self._current_process_file in self._need_translate_list:
             translate_flag = True
-            logger.debug(f'Current file is checked for translating')
+            if self._log_lines:
+                logger.debug(f'Current file is checked for translating')
         else:
             translate_flag = False
-            logger.debug(f'Current file is not checked for translating')
+            if self._log_lines:
+                logger.debug(f'Current file is not checked for translating')
         if translate_flag is False:
-            return " ".join((key_value["key"], key_value["value"], "#NT!"))
+            return " ".join((key_value.key, key_value.value, "#NT!"))
         else:
-            localization_value = key_value["value"]
-            logger.debug(f'Only text from line - {localization_value}')
+            localization_value = key_value.value
+            if self._log_lines:
+                logger.debug(f'Only text from line - {localization_value}')
             if localization_value[1:-1].strip() == "":
-                return " ".join((key_value["key"], key_value["value"]))
+                return " ".join((key_value.key, key_value.value))
             else:
                 try:
                     modified_line = self._modify_line(line=localization_value, flag="modify",
-                                                      pattern=self._shielded_values)
-                    translated_line = translator.translate(text=modified_line[1:-1])
-                    normal_string = self._modify_line(line=translated_line, flag="return_normal_view")
-                    self.file_info_data.add_translated_line(self._current_line_number)
-                    self.info_data.add_translated_chars(len(modified_line[1:-1]))
-                    self.file_info_data.add_api_service(translator.get_api_name())
-                    if self._disable_original_line:
-                        return " ".join((key_value["key"],
-                                         key_value["value"].replace(localization_value, f'\"{normal_string}\"'),
-                                         '#NT!'))
-                    return " ".join((key_value["key"], key_value["value"], f" <\"{normal_string}\">", " #NT!"))
-                except QuotaExceededException as error_text:
-                    error_text = f'{LanguageConstants.error_quota_exceeded} - {error_text}'
-                    logger.warning(error_text)
-                    translator.set_new_api_service(api_service='GoogleTranslator',
-                                                   last_source=translator.get_source_language(),
-                                                   last_target=translator.get_target_language())
-                    self.info_console_value.emit(f'{LanguageConstants.api_service_changed}{translator.get_api_name()}')
-                    self.file_info_data.add_api_service('GoogleTranslator')
-                    self.info_data.add_api_service('GoogleTranslator')
-                    self.info_console_value.emit(self._change_text_style(error_text, 'red'))
-                    return self._translate_line(translator=translator, key_value=key_value)
+                                                      pattern=self._shielded_values,
+                                                      api_service=self._prepared_api_service)
                 except Exception as error:
-                    self.file_info_data.add_line_with_error(self._current_line_number)
-                    error_text = f"{LanguageConstants.error_with_translation}\n{key_value['value']} {key_value['value']}\n{error}\n"
-                    logger.error(f'{error_text}')
-                    self.info_console_value.emit(self._change_text_style(error_text, 'red'))
-                    return " ".join((key_value['key'], key_value['value'], "#Translation Error!"))
+                    return self._get_error_line(line_number=self._current_line_number, key_value=key_value,
+                                                error=error)
+                if self._prepared_api_service is not None:
+                    # Файл готовится в пуле процессов: перевод строки выполнит основной процесс
+                    return self._defer_translation(key_value=key_value, sent_text=modified_line[1:-1])
+                return self._translate_modified_line(translator=translator, key_value=key_value,
+                                                     sent_text=modified_line[1:-1])
+
+    def _translate_modified_line(self, translator: TranslatorManager, key_value: LocalizationEntry,
+                                 sent_text: str) -> str:
+        r"""Перевод уже экранированной строки sent_text. Словарь экранированных значений - self._modified_values"""
+        try:
+            if self._planning:
+                self._planned_texts[sent_text] = self._planned_texts.get(sent_text, 0) + 1
+                self._planned_sources[sent_text] = key_value.value
+                self._planned_keys[key_value.value] = sent_text
+                self._planned_line = True
+                return ''
+            planned_text = self._planned_keys.get(key_value.value, sent_text)
+            if planned_text in self._planned_errors:
+                self._planned_line = True
+                return self._get_error_line(line_number=self._current_line_number, key_value=key_value,
+                                            error=self._planned_errors[planned_text])
+            memory_line, api_service = self._planned_translations.get(planned_text, (None, None))
+            self._planned_line = memory_line is not None
+            if memory_line is None:
+                memory_line = self._get_stored_translation(sent_text)
+            if memory_line is not None:
+                normal_string = self._modify_line(line=memory_line, flag="return_normal_view",
+                                                  api_service=api_service)
+                return self._get_translated_line(line_number=self._current_line_number,
+                                                 key_value=key_value, sent_text=sent_text,
+                                                 normal_string=normal_string, count_chars=False,
+                                                 api_service=api_service)
+            if translator.get_batch_limits() is not None or self._get_translation_concurrency() > 1:
+                return self._defer_translation(key_value=key_value, sent_text=sent_text)
+            for used_translator, _, sent_texts, translated_lines in self._iter_scheduled_batches(
+                    sources=[key_value.value], texts=[sent_text]):
+                if isinstance(translated_lines[0], Exception) or translated_lines[0] is None:
+                    return self._get_error_line(line_number=self._current_line_number, key_value=key_value,
+                                                error=translated_lines[0])
+                self._store_translation(sent_texts[0], used_translator, translated_lines[0])
+                normal_string = self._modify_line(line=translated_lines[0], flag="return_normal_view",
+                                                  api_service=used_translator.get_api_name())
+                return self._get_translated_line(line_number=self._current_line_number, key_value=key_value,
+                                                 sent_text=sent_texts[0], normal_string=normal_string,
+                                                 api_service=used_translator.get_api_name())
+        except TranslationCancelledError:
+            raise
+        except Exception as error:
+            return self._get_error_line(line_number=self._current_line_number, key_value=key_value, error=error)
+
+    def _get_memory_key(self, sent_text: str, translator: TranslatorManager | None = None) -> tuple[str, str, str, str]:
+        translator = translator or self._translator
+        return (translator.get_api_name(), *translator.get_language_codes(), sent_text)
+
+    def _get_stored_translation(self, sent_text: str) -> str | None:
+        r"""Перевод, уже полученный прерванным запуском (из журнала контрольных точек) или из памяти переводов"""
+        key = self._get_memory_key(sent_text)
+        translated_text = self._checkpoint_journal.translations.get(key)
+        if translated_text is not None:
+            return translated_text
+        return self._translation_memory.get(*key)
+
+    def _has_stored_translation(self, sent_text: str) -> bool:
+        r"""Проверка без побочных эффектов для пробного запуска: есть ли перевод в журнале контрольных точек
+        или в памяти переводов. Порядок LRU-кэша и статистика памяти переводов не меняются"""
+        key = self._get_memory_key(sent_text)
+        return key in self._checkpoint_journal.translations or self._translation_memory.peek(*key) is not None
+
+    def _store_translation(self, sent_text: str, translator: TranslatorManager, translated_text: str):
+        key = self._get_memory_key(sent_text, translator)
+        self._translation_memory.put(*key, translated_text)
+        self._checkpoint_journal.add_translation(key, translated_text)
+
+    def _get_translated_line(self, line_number: int, key_value: LocalizationEntry, sent_text: str,
+                             normal_string: str, count_chars: bool = True, api_service: str | None = None) -> str:
+        r"""Формирует итоговую строку с переводом. Переводы из памяти переводов и уже учтенные при планировании
+        не добавляются к количеству символов, отправленных сервису перевода"""
+        self.file_info_data.add_translated_line(line_number)
+        self.file_info_data.add_api_service(api_service or self._translator.get_api_name())
+        if count_chars:
+            self.info_data.add_translated_chars(len(sent_text))
+        if self._disable_original_line:
+            return " ".join((key_value.key,
+                             key_value.value.replace(key_value.value, f'\"{normal_string}\"'),
+                             '#NT!'))
+        return " ".join((key_value.key, key_value.value, f" <\"{normal_string}\">", " #NT!"))
+
+    def _get_error_line(self, line_number: int, key_value: LocalizationEntry, error) -> str:
+        self.file_info_data.add_line_with_error(line_number)
+        error_text = f"{LanguageConstants.error_with_translation}\n{key_value.value} {key_value.value}\n{error}\n"
+        logger.error(f'{error_text}')
+        self.info_console_value.emit(self._change_text_style(error_text, 'red'))
+        return " ".join((key_value.key, key_value.value, self.error_marker))
+
+    def _switch_to_reserve_translator(self, translator: TranslatorManager, error_text):
+        r"""Помечает квоту сервиса translator закончившейся. Следующие строки планировщик отдает резервным сервисам"""
+        error_text = f'{LanguageConstants.error_quota_exceeded} - {error_text}'
+        logger.warning(error_text)
+        self._scheduler.exhaust(translator)
+        reserve = self._scheduler.get_current()
+        if reserve is not None:
+            self.info_console_value.emit(f'{LanguageConstants.api_service_changed}{reserve.get_api_name()}')
+            self.file_info_data.add_api_service(reserve.get_api_name())
+            self.info_data.add_api_service(reserve.get_api_name())
+        self.info_console_value.emit(self._change_text_style(error_text, 'red'))
+
+    def _defer_translation(self, key_value: LocalizationEntry, sent_text: str) -> str:
+        r"""Откладывает перевод строки до конца файла, чтобы отправить ее вместе с остальными одним пакетом.
+        Вместе со строкой сохраняется словарь экранированных значений, так как он нужен для восстановления"""
+        self._pending_translations.append((self._current_line_number, key_value, sent_text, self._modified_values))
+        return ''
+
+    def _get_translation_concurrency(self) -> int:
+        return max(1, self._translation_concurrency.get(self._translator.get_api_name(), 1))
+
+    def _get_rate_limiter(self) -> RateLimiter:
+        r"""Ограничитель запросов текущего сервиса перевода. Создается один раз на сервис за запуск,
+        чтобы снижение частоты после отказов сервиса сохранялось между файлами"""
+        api_name = self._translator.get_api_name()
+        if api_name not in self._rate_limiters:
+            self._rate_limiters[api_name] = RateLimiter(rate=self._request_rates.get(api_name),
+                                                        max_concurrency=self._get_translation_concurrency())
+        return self._rate_limiters[api_name]
 
-    @logger.catch()
-    def _process_data(self):
-        r"""Здесь происходит процесс обработки файлов. Последовательное открытие, создание и запись"""
-        self.info_console_value.emit(f'{LanguageConstants.start_file_processing} - {self._calculate_time_delta()}\n')
-        self.info_data = InfoData(self._paths.get_target_path().name)
+    @staticmethod
+    def _translate_batch(texts: list[str], translator: TranslatorManager, rate_limiter: RateLimiter) -> list:
+        r"""Возвращает список переводов для пакета. Если пакетный запрос не удался, строки переводятся по одной,
+        чтобы ошибка была отнесена только к тем строкам, на которых она действительно возникла.
+        Вызывается из потоков пула, поэтому сервис и ограничитель передаются явно, а не берутся из self"""
+        try:
+            return rate_limiter.call(translator.translate_batch, texts)
+        except QuotaExceededException:
+            raise
+        except Exception as error:
+            if len(texts) == 1:
+                return [error]
+            logger.warning(f'Batch translation failed, translating line by line: {error}')
+        translated = []
+        for text in texts:
+            try:
+                translated.append(rate_limiter.call(translator.translate_batch, [text])[0])
+            except QuotaExceededException:
+                raise
+            except Exception as error:
+                translated.append(error)
+        return translated
+
+    def _iter_translated_batches(self, texts: list[str], batches: list[slice]):
+        r"""Переводит срезы texts в пуле потоков, держа в работе до N запросов одновременно
+        (N задается для каждого сервиса в настройках). Результаты отдаются строго в порядке batches,
+        поэтому порядок строк в файле не зависит от того, какой запрос завершился первым.
+        Если включен асинхронный перевод, запросы вместо пула потоков отправляются через AsyncTranslator"""
+        concurrency = self._get_translation_concurrency()
+        # Ограничитель создается до отправки запросов в пул, а не лениво из его потоков
+        translator = self._translator
+        rate_limiter = self._get_rate_limiter()
+        if self._async_translator is not None and self._async_translator.supports(translator):
+            translated_batches = self._async_translator.iter_translated_batches(
+                translator=translator, batches=[texts[batch] for batch in batches], concurrency=concurrency,
+                rate_limiter=rate_limiter)
+            try:
+                yield from zip(batches, translated_batches)
+            finally:
+                translated_batches.close()
+            return
+        if concurrency <= 1 or len(batches) <= 1:
+            for batch in batches:
+                if self._cancelled:
+                    raise TranslationCancelledError()
+                yield batch, self._translate_batch(texts[batch], translator, rate_limiter)
+            return
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(self._translate_batch, texts[batch], translator, rate_limiter)
+                       for batch in batches]
+            try:
+                for batch, future in zip(batches, futures):
+                    if self._cancelled:
+                        raise TranslationCancelledError()
+                    yield batch, future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _translate_pending_lines(self, writer: AtomicFileWriter | QueuedFileWriter | None = None,
+                                 progress: float = 0.0):
+        r"""Переводит пакетами все строки файла, отложенные в _defer_translation, и записывает их в _translated_list.
+        Одинаковые отправляемые строки файла переводятся одним запросом, перевод подставляется во все такие строки.
+        writer получает готовые строки по мере перевода пакетов: все строки до первой еще не переведенной.
+        progress - доля размера файла, приходящаяся на отложенные строки. Она учитывается после каждого пакета
+        пропорционально отправленным в нем символам.
+        Если перевод прервался ошибкой, непереведенные строки помечаются error_marker, чтобы файл не потерял их
+        молча и режим повторного перевода нашел их"""
+        if not self._pending_translations:
+            self._add_progress(progress)
+            return
+        pending = self._pending_translations
+        self._pending_translations = []
+        sources = []
+        texts = []
+        # Позиции в pending для каждой уникальной строки из texts
+        occurrences: list[list[int]] = []
+        unique_positions = {}
+        for position, (_, key_value, text, _) in enumerate(pending):
+            if text not in unique_positions:
+                unique_positions[text] = len(texts)
+                sources.append(key_value.value)
+                texts.append(text)
+                occurrences.append([])
+            occurrences[unique_positions[text]].append(position)
+        translated = [False] * len(pending)
+        first_untranslated = 0
+        total_chars = max(1, sum(len(text) * len(positions) for text, positions in zip(texts, occurrences)))
+        reported_progress = 0.0
+        try:
+            for translator, unique_batch, sent_texts, translated_lines in self._iter_scheduled_batches(sources, texts):
+                batch_progress = progress * sum(len(texts[unique_position]) * len(occurrences[unique_position])
+                                                for unique_position in unique_batch) / total_chars
+                for unique_position, text, translated_line in zip(unique_batch, sent_texts, translated_lines):
+                    failed = isinstance(translated_line, Exception) or translated_line is None
+                    if not failed:
+                        self._store_translation(text, translator, translated_line)
+                        # После смены сервиса пакет мог перевести резервный сервис, а не тот, что был выбран при открытии файла
+                        self.info_data.add_api_service(translator.get_api_name())
+                    for number, position in enumerate(occurrences[unique_position]):
+                        line_number, key_value, _, modified_values = pending[position]
+                        if failed:
+                            self._set_pending_result(line_number, self._get_error_line(line_number=line_number,
+                                                                                       key_value=key_value,
+                                                                                       error=translated_line))
+                            translated[position] = True
+                            continue
+                        if number:
+                            self.info_data.add_deduplicated_chars(len(text))
+                        normal_string = self._modify_line(line=translated_line, flag="return_normal_view",
+                                                          api_service=translator.get_api_name(),
+                                                          modified_values=modified_values)
+                        self._set_pending_result(line_number, self._get_translated_line(line_number=line_number,
+                                                                                        key_value=key_value,
+                                                                                        sent_text=text,
+                                                                                        normal_string=normal_string,
+                                                                                        count_chars=not number,
+                                                                                        api_service=translator.get_api_name()))
+                        translated[position] = True
+                if writer is not None:
+                    # После смены сервиса пакеты могут приходить не по порядку строк
+                    while first_untranslated < len(pending) and translated[first_untranslated]:
+                        first_untranslated += 1
+                    writer.write_ready(self._translated_list, pending[first_untranslated][0]
+                                       if first_untranslated < len(pending) else len(self._translated_list))
+                reported_progress += batch_progress
+                self._add_progress(batch_progress, status=f"{LanguageConstants.process_string} "
+                                                          f"{sum(translated)}/{len(pending)}\n"
+                                                          f"{LanguageConstants.of_file} {self._current_process_file.name}")
+        except TranslationCancelledError:
+            raise
+        except Exception as error:
+            logger.opt(exception=error).error(f'Batch translation of {self._current_process_file} failed')
+            for position, (line_number, key_value, _, _) in enumerate(pending):
+                if not translated[position]:
+                    self._set_pending_result(line_number, self._get_error_line(line_number=line_number,
+                                                                               key_value=key_value,
+                                                                               error=error))
+            self._add_progress(progress - reported_progress)
+
+    def _iter_scheduled_batches(self, sources: list[str], texts: list[str]):
+        r"""Распределяет строки texts между сервисами через планировщик и переводит их пакетами. Отдает четверки
+        (сервис, позиции строк в texts, отправленные строки, переводы). Если квота сервиса закончилась посреди
+        перевода, оставшиеся строки распределяются заново между следующими сервисами - в цикле, без рекурсии.
+        texts экранированы для текущего сервиса; для другого сервиса строка заново экранируется из sources"""
+        origin = self._translator
+        queue = deque(self._scheduler.assign([len(text) for text in texts]))
+        quota_error = QuotaExceededException('No translation service has enough quota left')
+        try:
+            while queue:
+                translator, positions = queue.popleft()
+                if translator is None:
+                    yield origin, positions, [texts[position] for position in positions], [quota_error] * len(positions)
+                    continue
+                self._translator = translator
+                group = [texts[position] if translator is origin else
+                         self._modify_line(line=sources[position], flag="modify", pattern=self._shielded_values)[1:-1]
+                         for position in positions]
+                processed = 0
+                measured = self._measured_translation.setdefault(translator.get_api_name(), [0, 0.0])
+                started = time.perf_counter()
+                try:
+                    for batch, translated_batch in self._iter_translated_batches(group,
+                                                                                 self._translator.get_translation_batches(group)):
+                        measured[0] += sum(map(len, group[batch]))
+                        measured[1] += time.perf_counter() - started
+                        yield translator, positions[batch], group[batch], translated_batch
+                        processed = batch.stop
+                        started = time.perf_counter()
+                except QuotaExceededException as error_text:
+                    quota_error = error_text
+                    self._switch_to_reserve_translator(translator=translator, error_text=error_text)
+                    rest = positions[processed:]
+                    queue.extend((reserve, [rest[number] for number in numbers]) for reserve, numbers
+                                 in self._scheduler.assign([len(group[number]) for number in range(processed,
+                                                                                                  len(group))]))
+        finally:
+            self._translator = self._scheduler.get_current() or origin
+
+    def _set_pending_result(self, line_number: int, line: str):
+        self._translated_list[line_number] = " " * self._default_padding + line + "\n"
+
+    @logger.catch(exclude=TranslationCancelledError)
+    def _plan_translations(self):
+        r"""Проходит по всем файлам тем же путем, что и _process_data, но вместо перевода собирает строки,
+        которые пришлось бы отправить сервису перевода. Каждая уникальная строка переводится один раз,
+        а при основной обработке результат подставляется во все строки, где она встречается"""
+        self.info_console_value.emit(f'{LanguageConstants.translation_planning_started} - '
+                                     f'{self._calculate_time_delta()}\n')
+        self.info_label_value.emit(LanguageConstants.translation_planning_started)
+        self._planning = True
+        # Доля размера файлов, приходящаяся на строки, которые переводятся при планировании
+        planned_progress = 0.0
         for file in self._paths.get_file_hierarchy():
-            start_time = time.time()
+            if file not in self._need_translate_list:
+                continue
+            if self._is_file_unchanged(file) or self._is_file_resumed(file):
+                continue
+            self._current_process_file = file
+            self.file_info_data = FileInfoData(filename=file)
+            try:
+                self._create_original_language_dictionary(self._paths.get_original_mode_path() / file)
+            except Exception as error:
+                # Ошибка разбора будет показана при обработке файла
+                logger.warning(f'Failed to read {file} for planning: {error}')
+                continue
+            line_chars = (self._paths.get_original_mode_path() / file).stat().st_size / max(
+                1, len(self._original_language_list))
+            for line_number, key_value in enumerate(self._original_language_list):
+                self._current_line_number = line_number
+                self._planned_line = False
+                self._create_translated_list(key_value=key_value)
+                if self._planned_line:
+                    planned_progress += line_chars
+        self._planning = False
+
+        texts = []
+        deduplicated_chars = 0
+        for text, occurrences in self._planned_texts.items():
+            deduplicated_chars += len(text) * (occurrences - 1)
+            memory_line = self._get_stored_translation(text)
+            if memory_line is None:
+                texts.append(text)
+            else:
+                self._planned_translations[text] = (memory_line, self._translator.get_api_name())
+        self.info_data.add_deduplicated_chars(deduplicated_chars)
+        logger.info(f'Planned {sum(self._planned_texts.values())} lines, {len(self._planned_texts)} unique, '
+                    f'{len(texts)} to translate')
+
+        # Прогресс строк из памяти переводов учитывается сразу, остальных - после каждого пакета
+        total_chars = max(1, sum(map(len, self._planned_texts)))
+        self._add_progress(planned_progress * (1 - sum(map(len, texts)) / total_chars))
+        translated = 0
+        sources = [self._planned_sources[text] for text in texts]
+        for translator, positions, sent_texts, translated_lines in self._iter_scheduled_batches(sources, texts):
+            translated += len(positions)
+            self._add_progress(planned_progress * sum(len(texts[position]) for position in positions) / total_chars,
+                               status=f'{LanguageConstants.unique_lines_translation} {translated}/{len(texts)}')
+            for position, sent_text, translated_line in zip(positions, sent_texts, translated_lines):
+                if isinstance(translated_line, Exception) or translated_line is None:
+                    self._planned_errors[texts[position]] = translated_line
+                    continue
+                self._planned_translations[texts[position]] = (translated_line, translator.get_api_name())
+                self._store_translation(sent_text, translator, translated_line)
+                self.info_data.add_api_service(translator.get_api_name())
+                self.info_data.add_translated_chars(len(sent_text))
+        self._translation_memory.flush()
+
+    def _get_target_file_path(self, file: Path) -> Path:
+        return self._paths.get_target_path() / str(file).replace(self._original_language, self._target_language)
+
+    def _get_source_hash(self, file: Path) -> str:
+        if file not in self._source_hashes:
+            self._source_hashes[file] = BuildManifest.get_file_hash(self._paths.get_original_mode_path() / file)
+        return self._source_hashes[file]
+
+    def _get_file_fingerprint(self, file: Path, original_language_list: list[LocalizationEntry]) -> dict:
+        r"""Отпечаток входных данных файла для манифеста сборки. Строки предыдущей версии перевода выбираются
+        по ключам из original_language_list - разобранных записей именно этого файла"""
+        previous_entries = None
+        if self._paths.get_previous_path_validate_result():
+            previous_entries = [(self._previous_version_dictionary.get(key_value.key),
+                                 self._previous_sources.get(key_value.key))
+                                for key_value in original_language_list]
+        translate = file in self._need_translate_list
+        return {
+            'source': self._get_source_hash(file),
+            'previous': BuildManifest.get_hash(previous_entries),
+            'vanilla': BuildManifest.get_hash(
+                [self._localization_index.get_version(self._paths.get_game_path(), language)
+                 for language in (self._original_language, self._target_language)]),
+            'settings': BuildManifest.get_hash({
+                'original_language': self._original_language,
+                'target_language': self._target_language,
+                'translate': translate,
+                'api_service': self._translator.get_api_name() if translate else None,
+                'protection_symbol': self._protection_symbol,
+                'disable_original_line': self._disable_original_line,
+            }),
+        }
+
+    def _is_file_resumed(self, file: Path) -> bool:
+        r"""Файл был полностью записан запуском, который затем прервался"""
+        return self._resume and self._checkpoint_journal.is_finished(file) and self._get_target_file_path(file).exists()
 
-            logger.info(f'Started file {file}')
+    @logger.catch()
+    def _is_file_unchanged(self, file: Path) -> bool:
+        r"""Файл можно пропустить, если отпечаток его входных данных совпадает с записанным в манифесте сборки,
+        а результат прошлого запуска лежит в целевой папке. Исходный файл разбирается только при совпадении хэша"""
+        if self._build_manifest is None:
+            return False
+        if file not in self._unchanged_files:
+            record = self._build_manifest.get(file)
+            unchanged = False
+            if record is not None and record.get('source') == self._get_source_hash(file) \
+                    and self._get_target_file_path(file).exists() and self._source_snapshot.get(file) is not None:
+                original_language_list = list(ModernParadoxParser(
+                    filename=self._paths.get_original_mode_path() / file).iter_entries())
+                unchanged = record == self._get_file_fingerprint(file, original_language_list)
+            self._unchanged_files[file] = unchanged
+        return self._unchanged_files[file]
+
+    @logger.catch()
+    def _estimate_translations(self):
+        r"""Пробный запуск: проходит по файлам тем же путем, что и _plan_translations, но ничего не переводит
+        и не записывает. Для каждого файла и для всего мода считает строки и символы, которые ушли бы сервису
+        перевода, попадания в память переводов и журнал контрольных точек, остаток квоты и примерное время
+        перевода по скорости сервиса, измеренной в прошлых запусках"""
+        self.info_console_value.emit(f'{LanguageConstants.estimation_started} - {self._calculate_time_delta()}\n')
+        self.info_label_value.emit(LanguageConstants.estimation_started)
+        self.info_data = EstimateData(self._paths.get_target_path().name)
+        self.info_data.add_api_service(self._translator.get_api_name())
+        run_texts = {}
+        memory_hits = {}
+        self._planning = True
+        for file in self._paths.get_file_hierarchy():
+            if file not in self._need_translate_list:
+                continue
+            if self._is_file_unchanged(file) or self._is_file_resumed(file):
+                self.info_data.add_skipped_files()
+                continue
             self._current_process_file = file
+            self.file_info_data = FileEstimateData(filename=file)
+            self._planned_texts = {}
+            try:
+                self._create_original_language_dictionary(self._paths.get_original_mode_path() / file)
+            except Exception as error:
+                self._report_failed_file(file=file, error=error)
+                continue
+            self.file_info_data.set_lines_in_files(len(self._original_language_list))
+            for line_number, key_value in enumerate(self._original_language_list):
+                self._current_line_number = line_number
+                self._create_translated_list(key_value=key_value)
+            for text, occurrences in self._planned_texts.items():
+                if text not in memory_hits:
+                    memory_hits[text] = self._has_stored_translation(text)
+                self.file_info_data.add_estimated_lines(lines=occurrences, chars=len(text) * occurrences,
+                                                        memory_hit=memory_hits[text])
+                run_texts[text] = run_texts.get(text, 0) + occurrences
+            self.info_data.add_file_info(self.file_info_data)
+        self._planning = False
+        self._planned_texts = {}
+
+        texts = [text for text in run_texts if not memory_hits[text]]
+        if not self._deduplicate_translations:
+            texts = [text for text in texts for _ in range(run_texts[text])]
+        chars = sum(map(len, texts))
+        throughput = self._translation_throughput.get(self._translator.get_api_name())
+        self.info_data.set_estimate(
+            lines=sum(run_texts[text] for text in run_texts if not memory_hits[text]),
+            chars=chars,
+            memory_hit_lines=sum(run_texts[text] for text in run_texts if memory_hits[text]),
+            deduplicated_chars=sum(len(text) * (run_texts[text] - 1) for text in run_texts
+                                   if not memory_hits[text]) if self._deduplicate_translations else 0,
+            requests=len(self._translator.get_translation_batches(texts)),
+            remaining_quota=self._scheduler.get_budgets(),
+            estimated_time=time.strftime('%H:%M:%S', time.gmtime(chars / throughput)) if throughput else '-')
+
+    @logger.catch(exclude=TranslationCancelledError)
+    def _retry_failed_lines(self):
+        r"""Ищет в файлах целевой папки строки, помеченные error_marker, и отправляет сервису перевода только их.
+        Номер строки в результате совпадает с номером строки исходного файла, поэтому перевод подставляется
+        на место ошибки, а остальные строки файла остаются как есть. Строки, которые снова не удалось перевести,
+        попадают в lines_with_errors с теми же номерами. Если исходный файл с тех пор изменился и строки
+        больше не совпадают, файл пропускается - его нужно обработать обычным запуском"""
+        self.info_console_value.emit(f'{LanguageConstants.retry_failed_started} - {self._calculate_time_delta()}\n')
+        for file in self._paths.get_file_hierarchy():
             original_file_full_path = self._paths.get_original_mode_path() / file
-            changed_file_full_path = self._paths.get_target_path() / str(file).replace(self._original_language,
-                                                                                       self._target_language)
+            changed_file_full_path = self._get_target_file_path(file)
+            self._add_progress(original_file_full_path.stat().st_size)
+            if file not in self._need_translate_list or not changed_file_full_path.exists():
+                continue
+            with changed_file_full_path.open(mode='r', encoding='utf-8-sig') as target_file:
+                target_lines = target_file.readlines()
+            failed_lines = [line_number for line_number, line in enumerate(target_lines)
+                            if line.rstrip().endswith(self.error_marker)]
+            if not failed_lines:
+                continue
+            start_time = time.time()
+            logger.info(f'Retrying {len(failed_lines)} failed lines in {file}')
+            self._current_process_file = file
             self.file_info_data = FileInfoData(filename=changed_file_full_path)
-            with changed_file_full_path.open(mode='w', encoding='utf-8-sig') as target_file:
-                info = f"{LanguageConstants.file_opened} {file} - {self._calculate_time_delta()}\n"
-                self.info_console_value.emit(info)
-
+            try:
                 self._create_original_language_dictionary(original_file_full_path)
-                amount_lines = len(self._original_language_list)
-                self.file_info_data.set_lines_in_files(amount_lines)
-                self.info_data.add_api_service(self._translator.get_api_name())
-                for line_number, key_value in enumerate(self._original_language_list):
-                    self._current_line_number = line_number
-                    self._create_translated_list(key_value=key_value)
-                    info = f"{LanguageConstants.process_string} {line_number + 1}/{amount_lines}\n" \
-                           f"{LanguageConstants.of_file} {str(original_file_full_path.name)}"
-                    self.info_label_value.emit(info)
-                    self.progress_bar_value.emit(original_file_full_path.stat().st_size /
-                                                 amount_lines /
-                                                 self._paths.get_original_files_size())
-                print(*self._translated_list, file=target_file, sep='', end='')
+            except Exception as error:
+                self._report_failed_file(file=file, error=error)
+                continue
+            if len(self._original_language_list) != len(target_lines) or any(
+                    target_lines[line_number].split(maxsplit=1)[0] != self._original_language_list[line_number].key
+                    for line_number in failed_lines):
+                logger.warning(f'Source file {file} changed since translation, retry skipped')
+                self.info_console_value.emit(self._change_text_style(
+                    f'{LanguageConstants.retry_file_changed} {file}\n', 'red'))
+                continue
+            self.info_console_value.emit(f'{LanguageConstants.file_opened} {file} - {self._calculate_time_delta()}\n')
+            self.file_info_data.set_lines_in_files(len(target_lines))
+            self.info_data.add_api_service(self._translator.get_api_name())
+            self._translated_list = target_lines
+            for line_number in failed_lines:
+                self._current_line_number = line_number
+                self._set_pending_result(line_number, self._translate_line(
+                    translator=self._translator, key_value=self._original_language_list[line_number]) or '')
+            self._translate_pending_lines()
+            for line_number in failed_lines:
+                if not self._translated_list[line_number].strip():
+                    # Строка не получила ни перевода, ни ошибки: метка нужна, чтобы ее нашел следующий повтор
+                    self._set_pending_result(line_number, self._get_error_line(
+                        line_number=line_number, key_value=self._original_language_list[line_number],
+                        error='Translation was not received'))
+            self._translation_memory.flush()
+            with AtomicFileWriter(changed_file_full_path) as writer:
+                writer.write_rest(self._translated_list)
             self.file_info_data.set_process_time(self._calculate_time_delta(start_time=start_time))
             self.info_data.add_file_info(self.file_info_data)
             self.info_data.add_translated_files()
+            self._record_file_build(file=file, file_info_data=self.file_info_data,
+                                    original_language_list=self._original_language_list)
+        self._add_progress(0, force=True)
+
+    @logger.catch(exclude=TranslationCancelledError)
+    def _process_data(self):
+        r"""Здесь происходит процесс обработки файлов. Последовательное открытие, создание и запись.
+        При file_processes > 1 разбор, сравнение с предыдущей версией и ванильной локализацией и экранирование
+        выполняются в пуле процессов, начиная с самых больших файлов. Перевод, запись и статистика остаются
+        в основном процессе и идут в порядке иерархии файлов, поэтому результат совпадает с последовательным"""
+        self.info_console_value.emit(f'{LanguageConstants.start_file_processing} - {self._calculate_time_delta()}\n')
+        executor = None
+        files = [file for file in self._paths.get_file_hierarchy()
+                 if not self._is_file_unchanged(file) and not self._is_file_resumed(file)]
+        if self._file_processes > 1 and len(files) > 1:
+            executor = self._create_file_executor(files)
+        try:
+            if self._pipeline_processing:
+                self._process_data_in_pipeline(files=files, executor=executor)
+            else:
+                prepared_files = self._submit_files(files=files, executor=executor)
+                for file in self._paths.get_file_hierarchy():
+                    start_time = time.time()
+                    if self._skip_file(file):
+                        continue
+                    self._process_file(file=file, start_time=start_time, prepared_file=prepared_files.pop(file, None))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        self._add_progress(0, force=True)
+
+    def _skip_file(self, file: Path) -> bool:
+        r"""Пропускает файл, не изменившийся с прошлого запуска или готовый до прерывания запуска"""
+        original_file_full_path = self._paths.get_original_mode_path() / file
+        if self._is_file_unchanged(file):
+            logger.info(f'Skipped unchanged file {file}')
+            self.info_console_value.emit(f"{LanguageConstants.file_skipped} {file} - "
+                                         f"{self._calculate_time_delta()}\n")
+            self._add_progress(original_file_full_path.stat().st_size, skipped=True)
+            self.info_data.add_skipped_files()
+            self._checkpoint_journal.finish_file(file)
+            return True
+        if self._is_file_resumed(file):
+            logger.info(f'Skipped file {file} finished before interruption')
+            self.info_console_value.emit(f"{LanguageConstants.file_resumed} {file} - "
+                                         f"{self._calculate_time_delta()}\n")
+            self._add_progress(original_file_full_path.stat().st_size, skipped=True)
+            self.info_data.add_translated_files()
+            return True
+        return False
+
+    def _get_file_preparer_parameters(self) -> tuple[dict, dict]:
+        r"""Параметры и состояние объекта, который только подготавливает файлы, без сервиса перевода"""
+        performer_parameters = {
+            'paths': self._paths,
+            'original_language': self._original_language,
+            'target_language': self._target_language,
+            'need_translate': True,
+            'need_translate_tuple': self._need_translate_list,
+            'protection_symbol': self._protection_symbol,
+            'performance_logging': not self._log_lines,
+        }
+        state = {
+            '_original_vanilla_dictionary': self._original_vanilla_dictionary,
+            '_target_vanilla_dictionary': self._target_vanilla_dictionary,
+            '_previous_version_dictionary': self._previous_version_dictionary,
+            '_previous_sources': self._previous_sources,
+            '_prepared_api_service': self._translator.get_api_name(),
+        }
+        return performer_parameters, state
+
+    def _create_file_executor(self, files: list[Path]) -> ProcessPoolExecutor:
+        r"""Пул процессов для подготовки файлов files. Каждый процесс получает копию словарей ванильной локализации
+        и предыдущей версии один раз при запуске и дальше только читает их по ключам строк. Поэтому в копии
+        остаются только ключи файлов files: вместо всей локализации игры в каждый процесс передается часть
+        размером с мод"""
+        performer_parameters, state = self._get_file_preparer_parameters()
+        keys = set()
+        for file in files:
+            # Файл, который не удается разобрать, упадет и при подготовке в пуле, а ошибка будет показана там
+            with suppress(Exception):
+                keys.update(key_value.key for key_value in
+                            ModernParadoxParser(filename=self._paths.get_original_mode_path() / file).iter_entries())
+        for name in ('_original_vanilla_dictionary', '_target_vanilla_dictionary', '_previous_version_dictionary',
+                     '_previous_sources'):
+            dictionary = state[name]
+            state[name] = {key: dictionary[key] for key in keys if key in dictionary}
+        return ProcessPoolExecutor(max_workers=self._file_processes, initializer=_init_file_worker,
+                                   initargs=(performer_parameters, state))
+
+    def _submit_files(self, files: list[Path], executor: ProcessPoolExecutor | None) -> dict[Path, Future]:
+        r"""Отправляет файлы на подготовку в пул процессов, начиная с самых больших"""
+        if executor is None:
+            return {}
+        return {file: executor.submit(_prepare_file, file) for file in
+                sorted(files, key=lambda file: (self._paths.get_original_mode_path() / file).stat().st_size,
+                       reverse=True)}
+
+    def _prepare_file(self, file: Path) -> tuple:
+        r"""Проходит по строкам файла в процессе пула. Строки, которые нужно перевести, только экранируются и
+        откладываются. Возвращает записи файла, список строк результата, отложенные строки, FileInfoData
+        и сервис, для которого экранированы отложенные строки"""
+        self._current_process_file = file
+        self.file_info_data = FileInfoData(filename=self._get_target_file_path(file))
+        self._create_original_language_dictionary(self._paths.get_original_mode_path() / file)
+        self.file_info_data.set_lines_in_files(len(self._original_language_list))
+        for line_number, key_value in enumerate(self._original_language_list):
+            self._current_line_number = line_number
+            self._create_translated_list(key_value=key_value)
+        pending = self._pending_translations
+        self._pending_translations = []
+        return self._original_language_list, self._translated_list, pending, self.file_info_data, \
+            self._prepared_api_service
+
+    def _translate_prepared_lines(self, pending: list, api_service: str, line_chars: float) -> float:
+        r"""Переводит строки, отложенные при подготовке файла в пуле процессов. Если с тех пор сменился сервис
+        перевода, строка экранируется заново для текущего сервиса. Возвращает долю прогресса строк,
+        снова отложенных для пакетного перевода"""
+        deferred_progress = 0.0
+        for line_number, key_value, sent_text, modified_values in pending:
+            self._current_line_number = line_number
+            self._planned_line = False
+            if self._translator.get_api_name() != api_service:
+                sent_text = self._modify_line(line=key_value.value, flag="modify", pattern=self._shielded_values)[1:-1]
+            else:
+                self._modified_values = modified_values
+            pending_lines = len(self._pending_translations)
+            line = self._translate_modified_line(translator=self._translator, key_value=key_value,
+                                                 sent_text=sent_text)
+            if line:
+                self._set_pending_result(line_number, line)
+            if len(self._pending_translations) > pending_lines:
+                deferred_progress += line_chars
+            elif not self._planned_line:
+                self._add_progress(line_chars)
+        return deferred_progress
+
+    @logger.catch(exclude=TranslationCancelledError)
+    def _process_file(self, file: Path, start_time: float, prepared_file: Future | None = None):
+        r"""Обработка одного файла мода. Исключение при обработке строки прерывает только этот файл.
+        prepared_file - результат подготовки файла в пуле процессов, если он используется"""
+        try:
+            with AtomicFileWriter(self._get_target_file_path(file)) as writer:
+                self._translate_file(file=file, prepared=prepared_file.result() if prepared_file else None,
+                                     writer=writer)
+                writer.write_rest(self._translated_list)
+        except TranslationCancelledError:
+            raise
+        except Exception as error:
+            self._report_failed_file(file=file, error=error)
+            return
+        self._finish_file(file=file, start_time=start_time, file_info_data=self.file_info_data,
+                          original_language_list=self._original_language_list)
+
+    def _translate_file(self, file: Path, prepared: tuple | None = None,
+                        writer: AtomicFileWriter | QueuedFileWriter | None = None) -> Path:
+        r"""Заполняет _translated_list переводом файла и возвращает путь, по которому его нужно записать.
+        prepared - результат _prepare_file, если файл уже подготовлен. writer получает готовые строки по ходу
+        обработки: сначала все строки до первой отложенной для пакетного перевода, затем отложенные
+        по мере перевода их пакетов"""
+        logger.info(f'Started file {file}')
+        self._current_process_file = file
+        original_file_full_path = self._paths.get_original_mode_path() / file
+        changed_file_full_path = self._get_target_file_path(file)
+        self.file_info_data = FileInfoData(filename=changed_file_full_path)
+        info = f"{LanguageConstants.file_opened} {file} - {self._calculate_time_delta()}\n"
+        self.info_console_value.emit(info)
+
+        # Прогресс строки, отложенной для пакетного перевода, учитывается после перевода ее пакета,
+        # а строки, переведенной при планировании, - уже учтен при планировании
+        if prepared is not None:
+            self._original_language_list, self._translated_list, pending, self.file_info_data, api_service = prepared
+            self.info_data.add_api_service(self._translator.get_api_name())
+            line_chars = original_file_full_path.stat().st_size / max(1, len(self._original_language_list))
+            self._add_progress(line_chars * (len(self._original_language_list) - len(pending)),
+                               status=f"{LanguageConstants.of_file} {original_file_full_path.name}")
+            deferred_progress = self._translate_prepared_lines(pending=pending, api_service=api_service,
+                                                               line_chars=line_chars)
+        else:
+            self._create_original_language_dictionary(original_file_full_path)
+            amount_lines = len(self._original_language_list)
+            self.file_info_data.set_lines_in_files(amount_lines)
+            self.info_data.add_api_service(self._translator.get_api_name())
+            line_chars = original_file_full_path.stat().st_size / max(1, amount_lines)
+            deferred_progress = 0.0
+            for line_number, key_value in enumerate(self._original_language_list):
+                self._current_line_number = line_number
+                self._planned_line = False
+                pending_lines = len(self._pending_translations)
+                self._create_translated_list(key_value=key_value)
+                if writer is not None:
+                    writer.write_ready(self._translated_list, self._pending_translations[0][0]
+                                       if self._pending_translations else line_number + 1)
+                if len(self._pending_translations) > pending_lines:
+                    deferred_progress += line_chars
+                elif not self._planned_line:
+                    info = f"{LanguageConstants.process_string} {line_number + 1}/{amount_lines}\n" \
+                           f"{LanguageConstants.of_file} {original_file_full_path.name}"
+                    self._add_progress(line_chars, status=info)
+        self._translate_pending_lines(writer=writer, progress=deferred_progress)
+        self._translation_memory.flush()
+        return changed_file_full_path
+
+    def _report_failed_file(self, file: Path, error: Exception):
+        r"""Файл не записан из-за ошибки. Он не попадает ни в манифест, ни в журнал контрольных точек,
+        поэтому следующий запуск обработает его заново"""
+        logger.opt(exception=error).error(f'Failed to process {file}')
+        self.info_console_value.emit(self._change_text_style(f'{file}: {error}\n', 'red'))
+
+    def _finish_file(self, file: Path, start_time: float, file_info_data: FileInfoData,
+                     original_language_list: list[LocalizationEntry]):
+        r"""Учет записанного файла: статистика, журнал контрольных точек, снимок исходного текста и манифест"""
+        file_info_data.set_process_time(self._calculate_time_delta(start_time=start_time))
+        self.info_data.add_file_info(file_info_data)
+        self.info_data.add_translated_files()
+        if not self._cancelled:
+            self._checkpoint_journal.finish_file(file)
+        self._record_file_build(file=file, file_info_data=file_info_data, original_language_list=original_language_list)
+
+    def _record_file_build(self, file: Path, file_info_data: FileInfoData,
+                           original_language_list: list[LocalizationEntry]):
+        r"""Запоминает исходный текст записанного файла в снимке и его отпечаток в манифесте сборки"""
+        self._source_snapshot.update(file, {key_value.key: key_value.value
+                                            for key_value in original_language_list[1:] if key_value.value})
+        if self._build_manifest is not None:
+            # Файл с ошибками перевода не записывается в манифест, чтобы в следующий раз обработать его заново
+            if file_info_data.lines_with_errors['value']:
+                self._build_manifest.discard(file)
+            else:
+                self._build_manifest.update(file, self._get_file_fingerprint(file, original_language_list))
+
+    def _process_data_in_pipeline(self, files: list[Path], executor: ProcessPoolExecutor | None):
+        r"""Обработка файлов конвейером из трех этапов, связанных очередями на pipeline_queue_size элементов:
+        подготовка (разбор, сравнение с предыдущей версией и ваниллой, экранирование) в отдельном потоке или
+        в пуле процессов, перевод в текущем потоке и запись в отдельном потоке. Пока переводится один файл,
+        следующий уже готовится, а готовые строки переводимого файла частями дописываются во временный файл.
+        Все этапы идут в порядке иерархии файлов,
+        поэтому результат совпадает с последовательной обработкой. Учет записанных файлов (статистика,
+        журнал, манифест) выполняется в текущем потоке"""
+        prepared_files = Queue(maxsize=self.pipeline_queue_size)
+        translated_files = Queue(maxsize=self.pipeline_queue_size)
+        written_files = Queue()
+        stop = threading.Event()
+        stages = [StageTimer('prepare'), StageTimer('translate'), StageTimer('write')]
+        prepare_stage, translate_stage, write_stage = stages
+        preparer = threading.Thread(target=self._prepare_stage, daemon=True,
+                                    args=(files, executor, prepared_files, prepare_stage, stop))
+        writer = threading.Thread(target=self._write_stage, daemon=True,
+                                  args=(translated_files, written_files, write_stage))
+        preparer.start()
+        writer.start()
+        try:
+            while (item := translate_stage.get(prepared_files)) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                file, prepared = item
+                with translate_stage.busy():
+                    start_time = time.time()
+                    if not self._skip_file(file):
+                        self._translate_pipeline_file(file=file, start_time=start_time, prepared=prepared,
+                                                      translated_files=translated_files, stage=translate_stage)
+                    self._finish_written_files(written_files)
+        finally:
+            stop.set()
+            translate_stage.put(translated_files, None)
+            writer.join()
+            while preparer.is_alive():
+                # Освобождает место в очереди, если подготовка ждет его после ошибки перевода
+                with suppress(Empty):
+                    prepared_files.get(timeout=0.1)
+            self._finish_written_files(written_files)
+        logger.info(f'Pipeline stages busy / idle: {", ".join(map(str, stages))}')
+        self.info_data.set_stage_timings(stages)
+
+    def _prepare_stage(self, files: list[Path], executor: ProcessPoolExecutor | None, prepared_files: Queue,
+                       stage: StageTimer, stop: threading.Event):
+        r"""Этап подготовки файлов. Для пропускаемых файлов вместо результата передается None,
+        а исключение при подготовке передается вместо результата, чтобы его обработал этап перевода.
+        Ошибка самого этапа передается в очередь отдельным элементом и поднимается заново этапом перевода;
+        завершающий None передается в любом случае, чтобы этап перевода не ждал вечно"""
+        try:
+            futures = self._submit_files(files=files, executor=executor)
+            preparer = None if executor is not None else _create_file_preparer(*self._get_file_preparer_parameters())
+            for file in self._paths.get_file_hierarchy():
+                if stop.is_set():
+                    return
+                prepared = None
+                if file in files:
+                    with stage.busy():
+                        try:
+                            prepared = futures.pop(file).result() if preparer is None else preparer._prepare_file(file)
+                        except Exception as error:
+                            prepared = error
+                stage.put(prepared_files, (file, prepared))
+        except Exception as error:
+            stage.put(prepared_files, error)
+        finally:
+            stage.put(prepared_files, None)
+
+    @logger.catch(exclude=TranslationCancelledError)
+    def _translate_pipeline_file(self, file: Path, start_time: float, prepared: tuple | Exception,
+                                 translated_files: Queue, stage: StageTimer):
+        try:
+            if isinstance(prepared, Exception):
+                raise prepared
+            writer = QueuedFileWriter(self._get_target_file_path(file), queue=translated_files, stage=stage)
+            try:
+                self._translate_file(file=file, prepared=prepared, writer=writer)
+                writer.write_rest(self._translated_list)
+            except BaseException:
+                writer.finish(None)
+                raise
+            writer.finish((file, start_time, self.file_info_data, self._original_language_list))
+        except TranslationCancelledError:
+            raise
+        except Exception as error:
+            self._report_failed_file(file=file, error=error)
+
+    @staticmethod
+    def _write_stage(translated_files: Queue, written_files: Queue, stage: StageTimer):
+        r"""Этап записи файлов. Строки файла приходят частями от QueuedFileWriter по мере перевода и сразу
+        дописываются во временный файл. Каждый записанный файл передается обратно вместе с ошибкой записи,
+        если она была"""
+        writer = None
+        error = None
+        while (item := stage.get(translated_files)) is not None:
+            changed_file_full_path, lines, result = item
+            with stage.busy():
+                try:
+                    if writer is None and error is None:
+                        writer = AtomicFileWriter(changed_file_full_path)
+                        writer.open()
+                    if error is None:
+                        if lines is not None:
+                            writer.write_lines(lines)
+                        elif result is not None:
+                            writer.commit()
+                        else:
+                            writer.discard()
+                except Exception as write_error:
+                    error = write_error
+                    writer.discard()
+            if lines is None:
+                if result is not None:
+                    written_files.put((*result, error))
+                writer = None
+                error = None
+
+    def _finish_written_files(self, written_files: Queue):
+        while True:
+            try:
+                file, start_time, file_info_data, original_language_list, error = written_files.get_nowait()
+            except Empty:
+                return
+            if error is not None:
+                logger.error(f'Failed to write {file}: {error}')
+                self.info_console_value.emit(self._change_text_style(f'{file}: {error}\n', 'red'))
+                continue
+            self._finish_file(file=file, start_time=start_time, file_info_data=file_info_data,
+                              original_language_list=original_language_list)
+
+
+_file_worker: ModernParadoxGamesPerformer | None = None
+
+
+def _create_file_preparer(performer_parameters: dict, state: dict) -> ModernParadoxGamesPerformer:
+    r"""Создает объект, который только подготавливает файлы, без сервиса перевода"""
+    preparer = ModernParadoxGamesPerformer(**performer_parameters)
+    for name, value in state.items():
+        setattr(preparer, name, value)
+    return preparer
+
+
+def _init_file_worker(performer_parameters: dict, state: dict):
+    global _file_worker
+    _file_worker = _create_file_preparer(performer_parameters, state)
+
+
+def _prepare_file(file: Path) -> tuple:
+    return _file_worker._prepare_file(file)
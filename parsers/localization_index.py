@@ -0,0 +1,115 @@
+import hashlib
+import pickle
+from pathlib import Path
+
+from loguru import logger
+
+from parsers.modern_paradox_parser import ModernParadoxParser
+
+
+class LocalizationIndex:
+    r"""Постоянный индекс ванильной локализации, хранящийся рядом с settings.json.
+    Для каждой пары (путь к игре, язык) хранится отдельный файл, в котором для каждого файла локализации
+    записаны его mtime, размер и разобранные пары ключ-значение. При повторном запуске заново разбираются
+    только изменившиеся файлы, остальные берутся из индекса"""
+    version = 1
+    suffixes = ['.yml', '.txt', ]
+
+    def __init__(self, index_directory: Path | None = None, workers: int = 1):
+        self._index_directory = index_directory
+        self._workers = workers
+        self.reparsed_files = 0
+        self.cached_files = 0
+        self._versions: dict[tuple[str, str], str] = {}
+
+    def _get_index_file(self, game_path: Path, language: str) -> Path:
+        game_hash = hashlib.sha1(str(game_path.resolve()).encode('utf-8')).hexdigest()[:16]
+        return self._index_directory / f'{game_hash}_{language}.pickle'
+
+    @logger.catch()
+    def _read_index(self, index_file: Path, game_path: Path, language: str) -> dict:
+        if not index_file.exists():
+            return {}
+        try:
+            with index_file.open(mode='rb') as file:
+                index = pickle.load(file)
+        except Exception as error:
+            logger.warning(f'Localization index {index_file} is damaged and will be rebuilt: {error}')
+            return {}
+        if not isinstance(index, dict) or index.get('version') != self.version or index.get('game_path') != str(game_path.resolve()) \
+                or index.get('language') != language:
+            return {}
+        return index.get('files', {})
+
+    @logger.catch()
+    def _write_index(self, index_file: Path, game_path: Path, language: str, files: dict):
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file = index_file.with_suffix('.tmp')
+        with temporary_file.open(mode='wb') as file:
+            pickle.dump({'version': self.version, 'game_path': str(game_path.resolve()),
+                         'language': language, 'files': files}, file, protocol=pickle.HIGHEST_PROTOCOL)
+        temporary_file.replace(index_file)
+
+    def get_version(self, game_path: Path, language: str) -> str | None:
+        r"""Версия ванильной локализации языка language, прочитанной последним вызовом get_localization_dictionary:
+        хэш путей, mtime и размеров всех ее файлов. Меняется при любом обновлении игры"""
+        return self._versions.get((str(game_path.resolve()), language))
+
+    def _set_version(self, game_path: Path, language: str, files: dict):
+        stats = sorted((relative_path, record['mtime'], record['size']) for relative_path, record in files.items())
+        self._versions[(str(game_path.resolve()), language)] = hashlib.sha1(
+            repr((self.version, stats)).encode('utf-8')).hexdigest()
+
+    def _get_filtered_dictionary(self, localization_path: Path, keys: set) -> dict:
+        files = [file for file in localization_path.rglob('*') if file.suffix in self.suffixes and file.is_file()]
+        stats = {str(file.relative_to(localization_path)): file.stat() for file in files}
+        self._set_version(localization_path.parent, localization_path.name,
+                          {relative_path: {'mtime': stat.st_mtime_ns, 'size': stat.st_size}
+                           for relative_path, stat in stats.items()})
+        dictionary = {}
+        for lines_dictionary in ModernParadoxParser.parse_files(files, workers=self._workers, keys=frozenset(keys)):
+            dictionary.update(lines_dictionary)
+        logger.info(f'Localization {localization_path}: {len(dictionary)} of {len(keys)} mod keys found')
+        return dictionary
+
+    @logger.catch()
+    def get_localization_dictionary(self, game_path: Path, language: str, keys: set | None = None) -> dict:
+        r"""Возвращает словарь всей ванильной локализации языка language. Порядок объединения файлов совпадает
+        с порядком обхода rglob, то есть при совпадении ключей побеждает последний файл.
+        Если передан keys, индекс не используется: файлы читаются потоково и в словаре остаются только ключи мода"""
+        localization_path = game_path / language
+        if keys is not None:
+            return self._get_filtered_dictionary(localization_path, keys)
+        cached_files = {}
+        index_file = None
+        if self._index_directory is not None:
+            index_file = self._get_index_file(game_path, language)
+            cached_files = self._read_index(index_file, game_path, language)
+        files = {}
+        changed_files = []
+        for file in localization_path.rglob('*'):
+            if file.suffix not in self.suffixes or not file.is_file():
+                continue
+            stat = file.stat()
+            relative_path = str(file.relative_to(localization_path))
+            record = cached_files.pop(relative_path, None)
+            if record is None or record['mtime'] != stat.st_mtime_ns or record['size'] != stat.st_size:
+                record = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'entries': None}
+                changed_files.append(file)
+            files[relative_path] = record
+        parsed_files = ModernParadoxParser.parse_files(changed_files, workers=self._workers)
+        for file, entries in zip(changed_files, parsed_files):
+            files[str(file.relative_to(localization_path))]['entries'] = entries
+        reparsed_files = len(changed_files)
+        changed = bool(changed_files or cached_files)
+        if changed and index_file is not None:
+            self._write_index(index_file, game_path, language, files)
+        self._set_version(game_path, language, files)
+        self.reparsed_files += reparsed_files
+        self.cached_files += len(files) - reparsed_files
+        logger.info(f'Localization index {localization_path}: {len(files) - reparsed_files} cached, '
+                    f'{reparsed_files} reparsed')
+        dictionary = {}
+        for record in files.values():
+            dictionary.update(record['entries'])
+        return dictionary
@@ -1,43 +1,86 @@
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Iterator
 
 from loguru import logger
 
 
+class LocalizationEntry:
+    r"""Одна строка файла локализации. Хранится в __slots__, а не в словаре {'key': ..., 'value': ...},
+    так как для больших модов накладные расходы на словарь каждой строки занимали большую часть памяти"""
+    __slots__ = ('key', 'value')
+
+    def __init__(self, key: str, value: str):
+        self.key = key
+        self.value = value
+
+    def __eq__(self, other):
+        if isinstance(other, LocalizationEntry):
+            return self.key == other.key and self.value == other.value
+        return NotImplemented
+
+    def __repr__(self):
+        return f'LocalizationEntry(key={self.key!r}, value={self.value!r})'
+
+
 class ModernParadoxParser:
+    # Ключ не может содержать кавычек, поэтому [^"]* не уходит в значение и не вызывает
+    # повторного перебора всей строки. Шаблон применяется только с начала строки (match),
+    # в отличие от findall, который перебирал все стартовые позиции.
+    _line_pattern = re.compile(r'(?P<key>[^"]*:)(?P<version>\d*) *(?P<value>".*")')
+
     def __init__(self, filename: Path):
         self._filename = filename
 
     @logger.catch()
-    def parse_file(self, get_list: bool = False) -> dict | list:
+    def parse_file(self, get_list: bool = False, keys: set | frozenset | None = None) -> dict | list[LocalizationEntry]:
+        r"""При переданном keys в словарь попадают только строки с ключами из этого множества"""
         if get_list:
-            result_storage = []
-        else:
-            result_storage = {}
-        if self._filename.is_file() and self._filename.suffix in ['.yml', '.txt', ]:
-            with self._filename.open(mode='r', encoding='utf-8-sig') as file:
-                lines = file.readlines()
-                for line in lines:
-                    key = self._get_localization_key(line=line)
-                    value = self._get_localization_value(line=line)
-                    if get_list:
-                        result_storage.append({'key': key, 'value': value})
-                    else:
-                        result_storage[key] = value
-        return result_storage
+            return list(self.iter_entries())
+        if keys is not None:
+            return {entry.key: entry.value for entry in self.iter_entries() if entry.key in keys}
+        return {entry.key: entry.value for entry in self.iter_entries()}
+
+    def iter_entries(self, buffer_size: int = 1024 * 1024) -> Iterator[LocalizationEntry]:
+        r"""Лениво отдает записи LocalizationEntry(key, value) по одной на каждую строку файла.
+        Файл читается через буфер размером buffer_size, поэтому в памяти никогда не находится целиком.
+        Исключения не перехватываются: ошибка посреди файла должна прервать обработку всего файла,
+        а не оборвать список записей"""
+        if not (self._filename.is_file() and self._filename.suffix in ['.yml', '.txt', ]):
+            return
+        with self._filename.open(mode='r', encoding='utf-8-sig', buffering=buffer_size) as file:
+            for line in file:
+                key, _, value = self.tokenize_line(line=line)
+                yield LocalizationEntry(key, value)
 
     @staticmethod
-    def _get_localization_key(pattern=r"(.*:)(\d*)( *)(\".*\")", line='') -> str | None:
-        separated_line = re.findall(pattern=pattern, string=line)
+    def parse_files(filenames: list[Path], workers: int = 1, keys: set | frozenset | None = None) -> list[dict]:
+        r"""Разбирает файлы в словари, при workers > 1 - в пуле процессов. Порядок результатов совпадает с порядком
+        filenames, чтобы при последующем объединении сохранялось правило 'побеждает последний файл'"""
+        parse = partial(_parse_file, keys=keys)
+        if workers <= 1 or len(filenames) < 2:
+            return [parse(filename) for filename in filenames]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(parse, filenames, chunksize=max(1, len(filenames) // (workers * 4))))
+
+    @classmethod
+    def tokenize_line(cls, line: str = '') -> tuple[str, str, str]:
+        r"""Разбирает строку за один проход и возвращает кортеж (ключ, номер версии, значение в кавычках).
+        К примеру: ' AI_UNIT_TOOLTIP_UNIT_STACK_NO_ORDER:0 "No order."' ->
+                   ('AI_UNIT_TOOLTIP_UNIT_STACK_NO_ORDER:', '0', '"No order."')
+        Для строк без ключа (комментарии, заголовок l_english:, пустые строки) ключом считается вся строка
+        без правых пробелов, а значением - текст между первой и последней кавычкой, если он есть"""
+        separated_line = cls._line_pattern.match(line)
         if separated_line:
-            return separated_line[0][0].strip()
-        else:
-            return line.rstrip()
+            return separated_line['key'].strip(), separated_line['version'], separated_line['value']
+        first_quote = line.find('"')
+        last_quote = line.rfind('"')
+        if first_quote < last_quote:
+            return line.rstrip(), '', line[first_quote:last_quote + 1]
+        return line.rstrip(), '', ''
 
-    @staticmethod
-    def _get_localization_value(pattern: str = r'(\".*\w*?.*\")', line: str = '') -> str | None:
-        value = re.findall(pattern=pattern, string=line)
-        if value:
-            return value[0].rstrip()
-        else:
-            return ''
+
+def _parse_file(filename: Path, keys: set | frozenset | None = None) -> dict:
+    return ModernParadoxParser(filename=filename).parse_file(keys=keys)
@@ -0,0 +1,70 @@
+import time
+from contextlib import contextmanager
+from itertools import repeat
+from pathlib import Path
+from queue import Queue
+
+from file_writer import AtomicFileWriter
+
+
+class StageTimer:
+    r"""Учет времени одного этапа конвейера обработки файлов. busy - время работы этапа, idle - время ожидания
+    в очередях: пустой входной (этап быстрее предыдущего) или заполненной выходной (этап быстрее следующего).
+    Узкое место конвейера - этап с наибольшим busy и наименьшим idle"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.busy_time = 0.0
+        self.idle_time = 0.0
+
+    @contextmanager
+    def busy(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.busy_time += time.perf_counter() - start
+
+    def get(self, queue: Queue):
+        start = time.perf_counter()
+        item = queue.get()
+        self.idle_time += time.perf_counter() - start
+        return item
+
+    def put(self, queue: Queue, item):
+        start = time.perf_counter()
+        queue.put(item)
+        self.idle_time += time.perf_counter() - start
+
+    def __str__(self):
+        return f'{self.name}: {self.busy_time:.2f} / {self.idle_time:.2f} s'
+
+
+class QueuedFileWriter:
+    r"""Замена AtomicFileWriter на этапе перевода конвейера: готовые строки файла не пишутся в этом потоке,
+    а частями по AtomicFileWriter.chunk_lines передаются через очередь этапу записи. Сообщения очереди:
+    (файл, строки, None) - очередная часть строк, (файл, None, итог) - конец файла. Итог None означает,
+    что перевод файла прервался и записанное нужно отбросить"""
+
+    def __init__(self, file: Path, queue: Queue, stage: StageTimer):
+        self.file = file
+        self._queue = queue
+        self._stage = stage
+        self._next_line = 0
+
+    def write_ready(self, lines: list[str], ready_lines: int):
+        r"""Передает строки lines до ready_lines (не включительно), если их набралось не меньше chunk_lines"""
+        if ready_lines - self._next_line >= AtomicFileWriter.chunk_lines:
+            self._write(lines, ready_lines)
+
+    def write_rest(self, lines: list[str]):
+        r"""Передает все оставшиеся строки lines"""
+        self._write(lines, len(lines))
+
+    def finish(self, result: tuple | None):
+        self._stage.put(self._queue, (self.file, None, result))
+
+    def _write(self, lines: list[str], end: int):
+        self._stage.put(self._queue, (self.file, lines[self._next_line:end], None))
+        lines[self._next_line:end] = repeat('', end - self._next_line)
+        self._next_line = end
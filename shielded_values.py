@@ -1,3 +1,4 @@
+import re
 
 
 class ShieldedValues:
@@ -14,3 +15,75 @@ class ShieldedValues:
     @classmethod
     def get_common_pattern(cls):
         return '|'.join(cls.wrapped)
+
+
+class ShieldingEngine:
+    r"""Экранирование значений, которые не должны переводиться, и их восстановление в переводе.
+    Шаблоны компилируются один раз, строка экранируется одним проходом регулярного выражения, а строка без
+    экранируемых значений возвращается как есть.
+    Словарь экранированных значений возвращается для каждой строки отдельно и не хранится в объекте,
+    поэтому один экземпляр можно использовать из нескольких потоков.
+    Для GoogleTranslator значение заменяется на "<символ защиты>_<номер>", номер - порядковый номер совпадения,
+    одинаковые значения получают номер первого совпадения. Для DeepLTranslator значение оборачивается в
+    <span translate="no">, а при восстановлении тег снимается"""
+    deepl_tag_pattern = re.compile(r'<[^>]*translate="no"[^>]*>(.*?)<[^>]*>')
+
+    def __init__(self, pattern: str = ShieldedValues.get_common_pattern(), protection_symbol: str | None = "☻"):
+        self.pattern = re.compile(pattern)
+        self._protection_symbol = protection_symbol or "☻"
+        # split с группой отдает текст вперемешку с совпадениями, совпадения на нечетных позициях.
+        # Поэтому в самом шаблоне не должно быть групп
+        self._split_pattern = re.compile(f'({pattern})')
+        # Готовые метки "<символ защиты>_<номер>". Список не меняется, а заменяется целиком, когда меток не хватает
+        self._tokens = self._create_tokens(32)
+
+    def _create_tokens(self, amount: int) -> list[str]:
+        return [f'{self._protection_symbol}_{number}' for number in range(amount)]
+
+    def _get_tokens(self, amount: int) -> list[str]:
+        if len(self._tokens) < amount:
+            self._tokens = self._create_tokens(amount * 2)
+        return self._tokens
+
+    def shield(self, line: str, api_service: str) -> tuple[str, dict[int, str]]:
+        r"""Возвращает экранированную для api_service строку и словарь {номер: значение} для восстановления"""
+        parts = self._split_pattern.split(line)
+        if len(parts) == 1:
+            # Совпадений нет - большинство строк без переменных не пересобираются
+            return line, {}
+        if api_service == "GoogleTranslator" and len(parts) == 3:
+            # Одно значение - самый частый случай после строк без значений
+            return parts[0] + self._tokens[0] + parts[2], {0: parts[1]}
+        values = parts[1::2]
+        if api_service == "GoogleTranslator":
+            tokens = self._get_tokens(len(values))
+            if len(set(values)) == len(values):
+                parts[1::2] = tokens[:len(values)]
+            else:
+                numbers = {}
+                for number, value in enumerate(values):
+                    parts[2 * number + 1] = tokens[numbers.setdefault(value, number)]
+        elif api_service == "DeepLTranslator":
+            parts[1::2] = [f'<span translate="no">{value}</span>' for value in values]
+        else:
+            return line, dict(enumerate(values))
+        return ''.join(parts), dict(enumerate(values))
+
+    def restore(self, line: str, modified_values: dict[int, str], api_service: str) -> str:
+        r"""Возвращает экранированные значения в переведенную строку. Метки заменяются от большего номера
+        к меньшему (словарь из shield упорядочен по возрастанию номеров), поэтому метка 1 не задевает метку 10.
+        Метки с номерами, которых нет в словаре, остаются как есть"""
+        if api_service == "GoogleTranslator":
+            if self._protection_symbol not in line:
+                return line
+            tokens = self._get_tokens(len(modified_values))
+            for number in reversed(modified_values):
+                line = line.replace(tokens[number], modified_values[number])
+            return line
+        if api_service == "DeepLTranslator":
+            if 'translate="no"' not in line:
+                return line
+            # В шаблоне одна группа - содержимое тега, поэтому split отдает текст вперемешку с содержимым тегов,
+            # и склейка равна sub(r'\1'), но без разбора шаблона замены на каждом совпадении
+            return ''.join(self.deepl_tag_pattern.split(line))
+        return line
@@ -1,5 +1,8 @@
+from multiprocessing import freeze_support
+
 from gui.main_window import run
 
 
 if __name__ == '__main__':
+    freeze_support()
     run()
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+from functools import partial
+from typing import Iterator
+
+import aiohttp
+import deepl
+from bs4 import BeautifulSoup
+from deep_translator.exceptions import NotValidLength, TooManyRequests, TranslationNotFound
+from loguru import logger
+
+from translators.rate_limiter import HttpStatusError, RateLimiter
+from translators.translator_manager import TranslatorManager
+
+
+class TranslationCancelledError(Exception):
+    r"""Перевод остановлен вызовом AsyncTranslator.cancel"""
+
+
+class AsyncTranslator:
+    r"""Асинхронный перевод пакетов через один пул keep-alive соединений aiohttp на сервис.
+    Синхронные клиенты deep_translator и deepl открывают соединение на каждый запрос, здесь же соединения
+    переиспользуются, а в работе одновременно держится до concurrency запросов.
+    Цикл событий свой и запускается из вызывающего потока (QThread исполнителя) на время каждого пакета,
+    поэтому исполнитель остается синхронным. Ответы разбираются так же, как в TranslatorManager.translate_batch"""
+    supported_apis = ['GoogleTranslator', 'DeepLTranslator', ]
+    google_max_chars = 5000
+
+    def __init__(self, timeout: float = 60):
+        self._timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def supports(cls, translator: TranslatorManager) -> bool:
+        return translator.get_api_name() in cls.supported_apis and translator.get_connection_details() is not None
+
+    async def _get_session(self, api_service: str, concurrency: int) -> aiohttp.ClientSession:
+        session = self._sessions.get(api_service)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+            session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self._timeout))
+            self._sessions[api_service] = session
+        return session
+
+    def iter_translated_batches(self, translator: TranslatorManager, batches: list[list[str]],
+                                concurrency: int = 4, rate_limiter: RateLimiter | None = None) -> Iterator[list]:
+        r"""Переводит пакеты batches, держа в работе до concurrency запросов, и отдает результаты строго
+        в порядке batches. Для каждого пакета отдается список переводов, в котором не переведенные строки
+        заменены исключениями. QuotaExceededException пробрасывается, оставшиеся запросы при этом отменяются.
+        После cancel выбрасывается TranslationCancelledError, и перевод останавливается.
+        С rate_limiter запросы дополнительно проходят через его ограничения и повторы после отказов сервиса"""
+        details = translator.get_connection_details()
+        session = self._loop.run_until_complete(self._get_session(translator.get_api_name(), concurrency))
+        semaphore = asyncio.Semaphore(concurrency)
+        request = partial(self._request, translator.get_api_name(), session, details)
+        if rate_limiter is not None:
+            request = partial(rate_limiter.call_async, request)
+        tasks = [self._loop.create_task(self._translate_batch(request, semaphore, texts)) for texts in batches]
+        self._tasks = tasks
+        try:
+            for task in tasks:
+                try:
+                    yield self._loop.run_until_complete(task)
+                except asyncio.CancelledError:
+                    raise TranslationCancelledError() from None
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._tasks = []
+
+    async def _translate_batch(self, request, semaphore: asyncio.Semaphore, texts: list[str]) -> list:
+        async with semaphore:
+            if self._cancelled.is_set():
+                raise TranslationCancelledError()
+            try:
+                return await request(texts)
+            except deepl.QuotaExceededException:
+                raise
+            except Exception as error:
+                if len(texts) == 1:
+                    return [error]
+                logger.warning(f'Batch translation failed, translating line by line: {error}')
+            translated = []
+            for text in texts:
+                try:
+                    translated.extend(await request([text]))
+                except deepl.QuotaExceededException:
+                    raise
+                except Exception as error:
+                    translated.append(error)
+            return translated
+
+    async def _request(self, api_service: str, session: aiohttp.ClientSession, details: dict,
+                       texts: list[str]) -> list[str]:
+        match api_service:
+            case 'GoogleTranslator':
+                if len(texts) == 1:
+                    return [await self._request_google(session, details, texts[0])]
+                translated = await self._request_google(session, details, TranslatorManager.batch_separator.join(texts))
+                return TranslatorManager.split_batch_translation(texts, translated)
+            case 'DeepLTranslator':
+                return await self._request_deepl(session, details, texts)
+
+    async def _request_google(self, session: aiohttp.ClientSession, details: dict, text: str) -> str:
+        r"""Повторяет GoogleTranslator.translate из deep_translator: тот же адрес, параметры и разбор страницы"""
+        if len(text) >= self.google_max_chars:
+            raise NotValidLength(text, 0, self.google_max_chars)
+        text = text.strip()
+        if details['source'] == details['target'] or not text:
+            return text
+        params = {'tl': details['target'], 'sl': details['source'], 'q': text}
+        async with session.get(details['url'], params=params, headers=details['headers']) as response:
+            if response.status == 429:
+                raise TooManyRequests()
+            if not 200 <= response.status <= 299:
+                raise HttpStatusError(response.status)
+            body = await response.text()
+        soup = BeautifulSoup(body, 'html.parser')
+        element = soup.find('div', {'class': 't0'}) or soup.find('div', {'class': 'result-container'})
+        if not element:
+            raise TranslationNotFound(text)
+        return element.get_text(strip=True)
+
+    async def _request_deepl(self, session: aiohttp.ClientSession, details: dict, texts: list[str]) -> list[str]:
+        payload = {'text': texts, 'source_lang': details['source'].upper(), 'target_lang': details['target'].upper(),
+                   'tag_handling': 'html'}
+        async with session.post(details['url'], json=payload, headers=details['headers']) as response:
+            status = response.status
+            content = await response.json(content_type=None) if 200 <= status < 300 else await response.text()
+        match status:
+            case 200:
+                return [translation['text'] for translation in content['translations']]
+            case 403:
+                raise deepl.AuthorizationException('Authorization failure, check auth_key', http_status_code=status)
+            case 456:
+                raise deepl.QuotaExceededException('Quota for this billing period has been exceeded',
+                                                   http_status_code=status)
+            case 429:
+                raise deepl.TooManyRequestsException('Too many requests', should_retry=True, http_status_code=status)
+            case _:
+                raise deepl.DeepLException(f'Unexpected status code {status}, content: {content}',
+                                           http_status_code=status)
+
+    def cancel(self):
+        r"""Отменяет все запросы в работе. Может вызываться из любого потока"""
+        self._cancelled.set()
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._cancel_tasks)
+
+    def _cancel_tasks(self):
+        for task in self._tasks:
+            task.cancel()
+
+    @logger.catch()
+    def close(self):
+        for session in self._sessions.values():
+            self._loop.run_until_complete(session.close())
+        self._sessions = {}
+        self._loop.close()
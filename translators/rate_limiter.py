@@ -0,0 +1,155 @@
+import asyncio
+import random
+import threading
+import time
+
+import aiohttp
+import deepl
+import requests
+from deep_translator.exceptions import RequestError, TooManyRequests
+from loguru import logger
+
+
+class HttpStatusError(RequestError):
+    r"""RequestError с кодом ответа сервиса. RequestError из deep_translator кода ответа не хранит, поэтому
+    неотличим от постоянной ошибки запроса (4xx) и не повторяется"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f'Request failed with status code {status_code}')
+        self.status_code = status_code
+
+
+def is_throttling_error(error: Exception) -> bool:
+    r"""Ошибки, после которых запрос имеет смысл повторить: сервис просит снизить частоту запросов (429),
+    временно недоступен (5xx) или соединение оборвалось. Превышение квоты DeepL и прочие ошибки запроса
+    сюда не относятся"""
+    match error:
+        case deepl.QuotaExceededException() | deepl.AuthorizationException():
+            return False
+        case deepl.TooManyRequestsException() | deepl.ConnectionException():
+            return True
+        case deepl.DeepLException():
+            return error.should_retry or (error.http_status_code or 0) >= 500
+        case TooManyRequests():
+            return True
+        case HttpStatusError():
+            return error.status_code >= 500
+        case requests.ConnectionError() | requests.Timeout() | aiohttp.ClientConnectionError() | asyncio.TimeoutError():
+            return True
+    return False
+
+
+class RateLimiter:
+    r"""Ограничитель запросов к одному сервису перевода: корзина токенов на rate запросов в секунду и
+    адаптивное число одновременных запросов по схеме AIMD. Каждый успешный запрос понемногу увеличивает
+    допустимое число одновременных запросов и частоту (вплоть до заданных), каждый отказ сервиса (429, 5xx)
+    уменьшает их вдвое. Запрос, на который пришел отказ, повторяется через экспоненциально растущую паузу.
+    Ограничитель общий для потоков исполнителя и для AsyncTranslator, поэтому не блокирует поток внутри
+    блокировки: try_acquire только сообщает, сколько подождать"""
+    poll_interval = 0.01
+
+    def __init__(self, rate: float | None = None, max_concurrency: int = 1, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 30.0):
+        self._max_rate = rate
+        self._rate = rate
+        self._tokens = float(max_concurrency)
+        self._burst = float(max_concurrency)
+        self._max_concurrency = max_concurrency
+        self._concurrency = float(max_concurrency)
+        self._in_flight = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._started = None
+        self._finished = None
+        self.requests = 0
+        self.throttled = 0
+
+    def try_acquire(self) -> float:
+        r"""Возвращает 0, если запрос можно отправлять, иначе количество секунд, через которое стоит спросить снова"""
+        with self._lock:
+            now = time.monotonic()
+            if self._rate is not None:
+                self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._in_flight >= int(self._concurrency):
+                return self.poll_interval
+            if self._rate is not None and self._tokens < 1:
+                return (1 - self._tokens) / self._rate
+            self._tokens -= 1
+            self._in_flight += 1
+            self.requests += 1
+            if self._started is None:
+                self._started = now
+            return 0
+
+    def release(self, throttled: bool = False):
+        with self._lock:
+            self._in_flight -= 1
+            self._finished = time.monotonic()
+            if throttled:
+                self.throttled += 1
+                self._concurrency = max(1.0, self._concurrency / 2)
+                if self._rate is not None:
+                    self._rate = max(self._max_rate / 16, self._rate / 2)
+            else:
+                self._concurrency = min(self._max_concurrency, self._concurrency + 1 / self._concurrency)
+                if self._rate is not None:
+                    self._rate = min(self._max_rate, self._rate + self._max_rate / 32)
+
+    def get_backoff_delay(self, attempt: int) -> float:
+        return min(self._max_delay, self._base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def get_effective_rate(self) -> float:
+        r"""Средняя частота запросов в секунду с первого запроса до завершения последнего"""
+        if self._started is None:
+            return 0.0
+        elapsed = (self._finished or time.monotonic()) - self._started
+        return self.requests / elapsed if elapsed > 0 else float(self.requests)
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        throttled = is_throttling_error(error)
+        self.release(throttled=throttled)
+        if not throttled or attempt >= self._max_retries:
+            return False
+        logger.warning(f'Translation request throttled ({error}), retry {attempt + 1}/{self._max_retries}')
+        return True
+
+    def call(self, function, *args):
+        r"""Вызывает function(*args) с учетом ограничений и повторяет вызов после отказов сервиса"""
+        attempt = 0
+        while True:
+            while (delay := self.try_acquire()) > 0:
+                time.sleep(delay)
+            try:
+                result = function(*args)
+            except Exception as error:
+                if not self._should_retry(error, attempt):
+                    raise
+                time.sleep(self.get_backoff_delay(attempt))
+                attempt += 1
+                continue
+            self.release()
+            return result
+
+    async def call_async(self, function, *args):
+        r"""То же, что call, для корутинной функции"""
+        attempt = 0
+        while True:
+            while (delay := self.try_acquire()) > 0:
+                await asyncio.sleep(delay)
+            try:
+                result = await function(*args)
+            except asyncio.CancelledError:
+                self.release()
+                raise
+            except Exception as error:
+                if not self._should_retry(error, attempt):
+                    raise
+                await asyncio.sleep(self.get_backoff_delay(attempt))
+                attempt += 1
+                continue
+            self.release()
+            return result
@@ -0,0 +1,99 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from loguru import logger
+
+
+class TranslationMemory:
+    r"""Память переводов: ответы сервиса перевода, сохраненные по ключу
+    (сервис, код исходного языка, код целевого языка, строка после экранирования в _modify_line).
+    Перед базой SQLite стоит ограниченный LRU-кэш в памяти. Без пути к базе работает только LRU-кэш,
+    то есть повторы запоминаются лишь в пределах одного запуска"""
+
+    def __init__(self, database_path: Path | None = None, lru_size: int = 20_000):
+        self._database_path = database_path
+        self._lru_size = lru_size
+        self._lru = OrderedDict()
+        self._unsaved = []
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_connection(self) -> sqlite3.Connection | None:
+        if self._connection is None and self._database_path is not None:
+            try:
+                self._database_path.parent.mkdir(parents=True, exist_ok=True)
+                self._connection = sqlite3.connect(self._database_path, check_same_thread=False)
+                self._connection.execute('CREATE TABLE IF NOT EXISTS translations ('
+                                         'api_service TEXT, source_code TEXT, target_code TEXT, '
+                                         'source_text TEXT, translated_text TEXT, '
+                                         'PRIMARY KEY (api_service, source_code, target_code, source_text))')
+            except sqlite3.Error as error:
+                logger.warning(f'Translation memory {self._database_path} is unavailable: {error}')
+                self._database_path = None
+                self._connection = None
+        return self._connection
+
+    def _remember(self, key: tuple, translated_text: str):
+        self._lru[key] = translated_text
+        self._lru.move_to_end(key)
+        if len(self._lru) > self._lru_size:
+            self._lru.popitem(last=False)
+
+    def get(self, api_service: str, source_code: str, target_code: str, source_text: str) -> str | None:
+        key = (api_service, source_code, target_code, source_text)
+        with self._lock:
+            translated_text = self._lru.get(key)
+            if translated_text is not None:
+                self._lru.move_to_end(key)
+            elif (connection := self._get_connection()) is not None:
+                row = connection.execute('SELECT translated_text FROM translations WHERE api_service = ? AND '
+                                         'source_code = ? AND target_code = ? AND source_text = ?', key).fetchone()
+                if row is not None:
+                    translated_text = row[0]
+                    self._remember(key, translated_text)
+            if translated_text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return translated_text
+
+    def peek(self, api_service: str, source_code: str, target_code: str, source_text: str) -> str | None:
+        r"""Как get, но не меняет порядок LRU-кэша, не добавляет в него строки из базы и не учитывается
+        в статистике попаданий. Нужен пробному запуску, который не должен влиять на основной"""
+        key = (api_service, source_code, target_code, source_text)
+        with self._lock:
+            translated_text = self._lru.get(key)
+            if translated_text is None and (connection := self._get_connection()) is not None:
+                row = connection.execute('SELECT translated_text FROM translations WHERE api_service = ? AND '
+                                         'source_code = ? AND target_code = ? AND source_text = ?', key).fetchone()
+                if row is not None:
+                    translated_text = row[0]
+            return translated_text
+
+    def put(self, api_service: str, source_code: str, target_code: str, source_text: str, translated_text: str):
+        key = (api_service, source_code, target_code, source_text)
+        with self._lock:
+            self._remember(key, translated_text)
+            self._unsaved.append((*key, translated_text))
+
+    @logger.catch()
+    def flush(self):
+        r"""Записывает в базу все переводы, добавленные после предыдущего вызова"""
+        with self._lock:
+            connection = self._get_connection()
+            if connection is not None and self._unsaved:
+                with connection:
+                    connection.executemany('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)',
+                                           self._unsaved)
+            self._unsaved = []
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
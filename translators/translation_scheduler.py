@@ -0,0 +1,80 @@
+from loguru import logger
+
+from translators.translator_manager import TranslatorManager
+
+
+class TranslationScheduler:
+    r"""Распределяет строки между сервисами перевода по приоритету и остатку квоты.
+    Первым идет выбранный пользователем сервис, за ним резервные из reserve_apis. Перед запуском остаток квоты
+    каждого сервиса читается через get_usage, и строка отдается первому сервису, у которого на нее хватает символов.
+    Сервис, ответивший QuotaExceededException, помечается исчерпанным, и оставшиеся строки распределяются
+    между следующими. Общий TranslatorManager из интерфейса при этом не переключается"""
+    reserve_apis = ['GoogleTranslator', ]
+
+    def __init__(self, translator: TranslatorManager):
+        self._translators = [translator]
+        # Остаток символов для каждого сервиса из _translators, None - без ограничений
+        self._budgets: list[int | None] = [None]
+        self._reserves_added = False
+
+    def read_budgets(self):
+        r"""Запрашивает остаток квоты у всех сервисов. Резервные сервисы добавляются сразу,
+        если хотя бы у одного сервиса квота ограничена"""
+        self._budgets = [translator.get_remaining_characters() for translator in self._translators]
+        for translator, budget in zip(self._translators, self._budgets):
+            logger.info(f'{translator.get_api_name()} remaining quota: '
+                        f'{"unlimited" if budget is None else f"{budget} chars"}')
+        if any(budget is not None for budget in self._budgets):
+            self._add_reserves()
+
+    def _add_reserves(self):
+        if self._reserves_added:
+            return
+        self._reserves_added = True
+        used_apis = {translator.get_api_name() for translator in self._translators}
+        for api_service in self.reserve_apis:
+            if api_service in used_apis:
+                continue
+            reserve = self._translators[0].get_reserve_translator(api_service=api_service)
+            self._translators.append(reserve)
+            self._budgets.append(reserve.get_remaining_characters())
+            logger.info(f'Reserve translation service {api_service} added')
+
+    def _find_translator(self, length: int) -> int | None:
+        for number, budget in enumerate(self._budgets):
+            if budget is None or budget >= length:
+                return number
+        if not self._reserves_added:
+            self._add_reserves()
+            return self._find_translator(length)
+        return None
+
+    def get_current(self) -> TranslatorManager | None:
+        r"""Сервис с наивысшим приоритетом, у которого еще осталась квота"""
+        for translator, budget in zip(self._translators, self._budgets):
+            if budget is None or budget > 0:
+                return translator
+        return None
+
+    def get_budgets(self) -> dict[str, int | None]:
+        return {translator.get_api_name(): budget for translator, budget in zip(self._translators, self._budgets)}
+
+    def assign(self, lengths: list[int]) -> list[tuple[TranslatorManager | None, list[int]]]:
+        r"""Распределяет строки с длинами lengths между сервисами и резервирует под них квоту.
+        Возвращает пары (сервис, позиции строк в lengths) в порядке приоритета сервисов.
+        Строки, на которые квоты не хватило ни у одного сервиса, отдаются с сервисом None"""
+        groups = {}
+        for position, length in enumerate(lengths):
+            number = self._find_translator(length)
+            if number is not None and self._budgets[number] is not None:
+                self._budgets[number] -= length
+            groups.setdefault(number, []).append(position)
+        return [(self._translators[number] if number is not None else None, groups[number])
+                for number in sorted(groups, key=lambda number: len(self._translators) if number is None else number)]
+
+    def exhaust(self, translator: TranslatorManager):
+        r"""Помечает квоту сервиса закончившейся"""
+        for number, current_translator in enumerate(self._translators):
+            if current_translator is translator:
+                self._budgets[number] = 0
+        self._add_reserves()
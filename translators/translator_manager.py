@@ -2,7 +2,13 @@ from deep_translator import GoogleTranslator, DeeplTranslator, YandexTranslator
 from deep_translator.exceptions import InvalidSourceOrTargetLanguage, LanguageNotSupportedException
 from deepl import AuthorizationException
 from loguru import logger
+import copy
 import deepl
+import re
+
+
+class BatchMismatchError(Exception):
+    r"""Количество строк в ответе на пакетный запрос не совпало с количеством отправленных строк"""
 
 
 class TranslatorManager:
@@ -14,6 +20,15 @@ class TranslatorManager:
     ]
     source_for_deepl = None
     target_for_deepl = None
+    # Ограничения одного пакетного запроса: (количество строк, количество символов)
+    batch_limits = {
+        'DeepLTranslator': (50, 100_000),
+        'GoogleTranslator': (100, 4_000),
+    }
+    # Google не принимает список строк, поэтому строки склеиваются через редкий символ на отдельной строке.
+    # Лимит в 4000 символов оставляет запас под разделители до ограничения Google в 5000 символов
+    batch_separator = '\n∰\n'
+    _batch_separator_pattern = re.compile(r'\s*∰\s*')
 
     def __init__(
             self,
@@ -27,6 +42,7 @@ class TranslatorManager:
         self._target_language = target_language
         self._api_service = api_service
         self._api_key = api_key
+        self._google_batch_translation = True
 
         self._init_translator_obj()
 
@@ -126,11 +142,20 @@ class TranslatorManager:
     def get_api_name(self):
         return self._api_service
 
+    def get_language_codes(self) -> tuple[str, str]:
+        r"""Коды исходного и целевого языков, с которыми сейчас работает сервис перевода"""
+        match self._api_service:
+            case 'DeepLTranslator':
+                return self.source_for_deepl, self.target_for_deepl
+            case _:
+                return (self.source_supported_languages.get(self._source_language, self._source_language),
+                        self.target_supported_languages.get(self._target_language, self._target_language))
+
     @logger.catch()
     def translate(self, text: str):
         match self._api_service:
             case 'GoogleTranslator':
-                return self._translator.translate(text)
+                return self._get_google_translator().translate(text)
             case 'DeepLTranslator':
                 self._translator: deepl.Translator
                 return self._translator.translate_text(text=text,
@@ -140,6 +165,109 @@ class TranslatorManager:
             case _:
                 return self._translator.translate(text)
 
+    def _get_google_translator(self) -> GoogleTranslator:
+        r"""GoogleTranslator хранит параметры запроса вместе с самим текстом в общем словаре _url_params.
+        При переводе из нескольких потоков запросы подменяли бы текст друг друга, поэтому каждый вызов
+        работает с копией объекта и собственным словарем параметров"""
+        if not isinstance(self._translator, GoogleTranslator):
+            return self._translator
+        translator = copy.copy(self._translator)
+        translator._url_params = dict(self._translator._url_params)
+        return translator
+
+    @logger.catch()
+    def get_remaining_characters(self) -> int | None:
+        r"""Остаток квоты в символах по данным get_usage. None, если сервис не ограничивает количество символов
+        или остаток узнать не удалось"""
+        if self._api_service != 'DeepLTranslator' or not isinstance(self._translator, deepl.Translator):
+            return None
+        usage = self._translator.get_usage()
+        if usage.character is None or not usage.character.valid:
+            return None
+        return max(0, usage.character.limit - usage.character.count)
+
+    def get_reserve_translator(self, api_service: str = 'GoogleTranslator') -> 'TranslatorManager':
+        r"""Отдельный менеджер другого сервиса с теми же исходным и целевым языками.
+        В отличие от set_new_api_service текущий менеджер не меняется"""
+        reserve = TranslatorManager(source_language=self._source_language, target_language=self._target_language)
+        reserve.source_supported_languages = self.source_supported_languages
+        reserve.target_supported_languages = self.target_supported_languages
+        reserve.set_google_batch_translation(self._google_batch_translation)
+        reserve.set_new_api_service(api_service=api_service,
+                                    last_source=self._source_language,
+                                    last_target=self._target_language)
+        return reserve
+
+    def get_batch_limits(self) -> tuple[int, int] | None:
+        r"""Возвращает ограничения пакетного перевода для текущего сервиса или None,
+        если сервис переводит только по одной строке"""
+        if self._api_service == 'GoogleTranslator' and not self._google_batch_translation:
+            return None
+        return self.batch_limits.get(self._api_service)
+
+    def get_translation_batches(self, texts: list[str]) -> list[slice]:
+        r"""Делит список строк на срезы, каждый из которых укладывается в ограничения пакетного запроса.
+        Для сервисов без пакетного перевода каждый срез содержит одну строку"""
+        if self.get_batch_limits() is None:
+            return [slice(number, number + 1) for number in range(len(texts))]
+        max_lines, max_chars = self.get_batch_limits()
+        batches = []
+        start = 0
+        batch_chars = 0
+        for number, text in enumerate(texts):
+            if number > start and (number - start >= max_lines or batch_chars + len(text) > max_chars):
+                batches.append(slice(start, number))
+                start = number
+                batch_chars = 0
+            batch_chars += len(text)
+        if start < len(texts):
+            batches.append(slice(start, len(texts)))
+        return batches
+
+    def set_google_batch_translation(self, enabled: bool):
+        self._google_batch_translation = enabled
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        r"""Переводит список строк одним запросом. В отличие от translate исключения не перехватываются,
+        чтобы вызывающий код мог отнести ошибку к конкретным строкам"""
+        match self._api_service:
+            case 'DeepLTranslator':
+                self._translator: deepl.Translator
+                results = self._translator.translate_text(text=texts,
+                                                          source_lang=self.source_for_deepl,
+                                                          target_lang=self.target_for_deepl,
+                                                          tag_handling='html')
+                return [result.text for result in results]
+            case 'GoogleTranslator':
+                translator = self._get_google_translator()
+                if len(texts) == 1:
+                    return [translator.translate(texts[0])]
+                translated = translator.translate(self.batch_separator.join(texts))
+                return self.split_batch_translation(texts, translated)
+            case _:
+                return [self._translator.translate(text) for text in texts]
+
+    @classmethod
+    def split_batch_translation(cls, texts: list[str], translated: str) -> list[str]:
+        r"""Делит ответ на склеенный через batch_separator запрос обратно на строки"""
+        translated_texts = cls._batch_separator_pattern.split(translated.strip())
+        if len(translated_texts) != len(texts):
+            raise BatchMismatchError(f'Sent {len(texts)} lines, received {len(translated_texts)}')
+        return translated_texts
+
+    def get_connection_details(self) -> dict | None:
+        r"""Адрес сервиса, заголовки и коды языков, нужные для отправки запросов в обход синхронных клиентов.
+        None, если для текущего сервиса прямые запросы не поддерживаются"""
+        match self._api_service:
+            case 'GoogleTranslator' if isinstance(self._translator, GoogleTranslator):
+                return {'url': self._translator._base_url, 'headers': {},
+                        'source': self._translator._source, 'target': self._translator._target}
+            case 'DeepLTranslator' if isinstance(self._translator, deepl.Translator):
+                return {'url': f'{self._translator._server_url}/v2/translate', 'headers': dict(self._translator.headers),
+                        'source': self.source_for_deepl, 'target': self.target_for_deepl}
+            case _:
+                return None
+
     def __eq__(self, other):
         if self._api_service == other:
             return True